@@ -1,32 +1,29 @@
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Protocol
 from Model.models import GameEvent
-from .ai_strategy_base import AIStrategy
+from .ai_strategy_base import AIStrategy, AIStrategyFactory
 
 # 抽象工厂接口
-class AbstractGameFactory(ABC):
+class AbstractGameFactory(Protocol):
     """游戏组件抽象工厂"""
     
-    @abstractmethod
     def create_ai_strategy(self, difficulty: str) -> AIStrategy:
         """创建AI策略"""
-        pass
+        ...
     
-    @abstractmethod
     def create_chance_events(self) -> List[GameEvent]:
         """创建幸运事件"""
-        pass
+        ...
     
-    @abstractmethod
     def create_misfortune_events(self) -> List[GameEvent]:
         """创建不幸事件"""
-        pass
+        ...
 
 # 工厂管理器
 class GameFactoryManager:
     """游戏工厂管理器 - 根据游戏模式选择合适的工厂"""
     
     _factories = {}
+    _instances = {}  # 工厂实例缓存，工厂无状态，可以复用
     
     @classmethod
     def get_factory(cls, game_mode: str = "standard") -> AbstractGameFactory:
@@ -36,8 +33,12 @@ class GameFactoryManager:
         if not cls._factories:
             cls._initialize_factories()
         
-        factory_class = cls._factories.get(game_mode.lower(), StandardGameFactory)
-        return factory_class()
+        mode = game_mode.lower()
+        factory = cls._instances.get(mode)
+        if factory is None:
+            factory_class = cls._factories.get(mode, StandardGameFactory)
+            factory = cls._instances[mode] = factory_class()
+        return factory
     
     @classmethod
     def _initialize_factories(cls):
@@ -57,9 +58,14 @@ class GameFactoryManager:
     @classmethod
     def register_factory(cls, mode: str, factory_class: type):
         """注册新的工厂类型"""
+        from .events import EventFactory
+        
         if not cls._factories:
             cls._initialize_factories()
         cls._factories[mode.lower()] = factory_class
+        cls._instances.pop(mode.lower(), None)
+        EventFactory.clear_cache(mode)
+        AIStrategyFactory.clear_cache(mode)
     
     @classmethod
     def get_available_modes(cls) -> List[str]:
@@ -1,41 +1,55 @@
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Protocol, Tuple
 from Model.models import Player, MapCell
 
-class AIStrategy(ABC):
+class AIStrategy(Protocol):
     """AI策略接口 - 策略模式"""
     
-    @abstractmethod
+    __slots__ = ()
+    
     def decide_purchase(self, player: Player, cell: MapCell, game_state: Dict[str, Any]) -> bool:
         """决定是否购买房产"""
-        pass
+        ...
     
-    @abstractmethod
     def decide_upgrade(self, player: Player, properties: List[MapCell]) -> Optional[int]:
         """决定升级哪个房产"""
-        pass
+        ...
     
-    @abstractmethod
     def decide_jail_action(self, player: Player) -> str:
         """决定在监狱中的行动：'pay', 'wait', 'use_item'"""
-        pass
+        ...
     
-    @abstractmethod
     def decide_trade(self, player: Player, other_players: List[Player], 
                     properties: List[MapCell]) -> Optional[Dict[str, Any]]:
         """决定是否进行交易"""
-        pass
+        ...
 class AIStrategyFactory:
     """AI策略工厂 -抽象工厂模式"""
     
-    @staticmethod
-    def create_strategy(difficulty: str, game_mode: str = "standard") -> AIStrategy:
+    # 策略对象无状态，相同(游戏模式, 难度)的AI玩家共享同一个实例
+    _strategy_cache: Dict[Tuple[str, str], AIStrategy] = {}
+    
+    @classmethod
+    def create_strategy(cls, difficulty: str, game_mode: str = "standard") -> AIStrategy:
         """根据难度和游戏模式创建AI策略"""
         from .abstract_factory import GameFactoryManager
         
-        # 使用抽象工厂模式
-        factory = GameFactoryManager.get_factory(game_mode)
-        return factory.create_ai_strategy(difficulty)
+        key = (game_mode.lower(), difficulty.lower())
+        strategy = cls._strategy_cache.get(key)
+        if strategy is None:
+            # 使用抽象工厂模式
+            factory = GameFactoryManager.get_factory(game_mode)
+            strategy = cls._strategy_cache[key] = factory.create_ai_strategy(difficulty)
+        return strategy
+    
+    @classmethod
+    def clear_cache(cls, game_mode: Optional[str] = None):
+        """清除策略缓存，未指定模式时全部清除"""
+        if game_mode is None:
+            cls._strategy_cache.clear()
+        else:
+            mode = game_mode.lower()
+            for key in [k for k in cls._strategy_cache if k[0] == mode]:
+                del cls._strategy_cache[key]
 
 class AIPlayer:
     """AI玩家控制器"""
@@ -1,11 +1,13 @@
 import random
 from typing import List, Dict, Any, Optional
 from .ai_strategy_base import AIStrategy
-from Model.models import Player, MapCell, CellType, PropertyLevel
+from Model.models import Player, MapCell, CellType
 
 class EasyAIStrategy(AIStrategy):
     """简单AI策略 - 保守型"""
     
+    __slots__ = ()  # 无状态策略，可被多个AI玩家共享
+    
     def decide_purchase(self, player: Player, cell: MapCell, game_state: Dict[str, Any]) -> bool:
         """简单AI购买决策：只在有足够资金时购买便宜房产"""
         if cell.cell_type not in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY]:
@@ -27,14 +29,18 @@ class EasyAIStrategy(AIStrategy):
         if player.money < 5000:
             return None
         
-        upgradeable = [p for p in properties if p.can_upgrade() and p.owner_id == player.id]
-        if not upgradeable:
+        # 单次遍历找出升级成本最低的可升级房产
+        player_id = player.id
+        cheapest = None
+        for prop in properties:
+            if prop.owner_id == player_id and prop.can_upgrade():
+                if cheapest is None or prop.upgrade_cost < cheapest.upgrade_cost:
+                    cheapest = prop
+        if cheapest is None:
             return None
         
         # 随机决定是否升级（30%概率）
         if random.random() < 0.3:
-            # 选择升级成本最低的房产
-            cheapest = min(upgradeable, key=lambda p: p.upgrade_cost)
             if player.money >= cheapest.upgrade_cost + 2000:  # 保留安全资金
                 return cheapest.position
         
@@ -56,6 +62,8 @@ class EasyAIStrategy(AIStrategy):
 class MediumAIStrategy(AIStrategy):
     """中等AI策略 - 平衡型"""
     
+    __slots__ = ()
+    
     def decide_purchase(self, player: Player, cell: MapCell, game_state: Dict[str, Any]) -> bool:
         """中等AI购买决策：考虑投资回报率"""
         if cell.cell_type not in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY]:
@@ -87,24 +95,21 @@ class MediumAIStrategy(AIStrategy):
         if player.money < 3000:
             return None
         
-        upgradeable = [p for p in properties if p.can_upgrade() and p.owner_id == player.id]
-        if not upgradeable:
-            return None
-        
         # 计算升级后的收益增长
+        player_id = player.id
+        money = player.money
         best_property = None
         best_roi = 0
         
-        for prop in upgradeable:
-            current_rent = prop.get_rent()
-            # 模拟升级后的租金
-            temp_level = PropertyLevel(prop.level.value + 1)
-            future_rent = prop.rent_base * (2 ** temp_level.value) if temp_level.value > 0 else prop.rent_base
+        for prop in properties:
+            if prop.owner_id != player_id or not prop.can_upgrade():
+                continue
             
-            rent_increase = future_rent - current_rent
+            # 房产租金为 rent_base * 2^等级，升级后租金翻倍，增量即当前租金
+            rent_increase = prop.rent_base << prop.level
             upgrade_roi = rent_increase / prop.upgrade_cost if prop.upgrade_cost > 0 else 0
             
-            if upgrade_roi > best_roi and player.money >= prop.upgrade_cost + 1500:
+            if upgrade_roi > best_roi and money >= prop.upgrade_cost + 1500:
                 best_roi = upgrade_roi
                 best_property = prop
         
@@ -160,6 +165,8 @@ class MediumAIStrategy(AIStrategy):
 class HardAIStrategy(AIStrategy):
     """困难AI策略 - 激进型"""
     
+    __slots__ = ()
+    
     def decide_purchase(self, player: Player, cell: MapCell, game_state: Dict[str, Any]) -> bool:
         """困难AI购买决策：激进投资策略"""
         if cell.cell_type not in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY, CellType.LANDMARK]:
@@ -187,16 +194,23 @@ class HardAIStrategy(AIStrategy):
         if player.money < 2000:
             return None
         
-        upgradeable = [p for p in properties if p.can_upgrade() and p.owner_id == player.id]
-        if not upgradeable:
+        # 单次遍历同时记录高价值房产和全部房产中租金最高者
+        player_id = player.id
+        best_high = None
+        best_any = None
+        for prop in properties:
+            if prop.owner_id != player_id or not prop.can_upgrade():
+                continue
+            rent = prop.get_rent()
+            if best_any is None or rent > best_any[0]:
+                best_any = (rent, prop)
+            if prop.price >= 2000 and (best_high is None or rent > best_high[0]):
+                best_high = (rent, prop)
+        if best_any is None:
             return None
         
-        # 优先升级高价值房产
-        high_value = [p for p in upgradeable if p.price >= 2000]
-        target_properties = high_value if high_value else upgradeable
-        
-        # 选择租金最高的房产升级
-        best_property = max(target_properties, key=lambda p: p.get_rent())
+        # 优先升级高价值房产，选择租金最高的房产升级
+        best_property = (best_high or best_any)[1]
         
         if player.money >= best_property.upgrade_cost + 1000:
             # 70%概率执行升级
@@ -1,21 +1,22 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Protocol
 
 
-class Command(ABC):
+class Command(Protocol):
     """命令接口 - 命令模式"""
     
-    @abstractmethod
+    __slots__ = ()
+    
     def execute(self) -> Dict[str, Any]:
-        """执行命令"""
-        pass
+        """执行命令
+        
+        返回的结果字典应视为只读：失败结果可能是共享的只读映射，需要修改时请先复制
+        """
+        ...
     
-    @abstractmethod
     def undo(self) -> Dict[str, Any]:
         """撤销命令"""
-        pass
+        ...
     
-    @abstractmethod
     def get_description(self) -> str:
         """获取命令描述"""
-        pass
\ No newline at end of file
+        ...
\ No newline at end of file
@@ -1,75 +1,97 @@
 from typing import List, Dict, Any, Optional
 import random
-from Model.models import Player, MapCell, PropertyLevel
+from types import MappingProxyType
+from Model.models import Player, MapCell, Effect
 from .command_base import Command
 
+# 常见失败结果，调用方只读取不修改，以只读映射共享同一个实例
+_FAIL_CMD_EXECUTED = MappingProxyType({"success": False, "message": "命令已执行"})
+_FAIL_CMD_NOT_EXECUTED = MappingProxyType({"success": False, "message": "命令未执行"})
+_FAIL_ALREADY_OWNED = MappingProxyType({"success": False, "message": "房产已有主人"})
+_FAIL_NOT_OWNER = MappingProxyType({"success": False, "message": "不是您的房产"})
+_FAIL_CANNOT_UPGRADE = MappingProxyType({"success": False, "message": "房产无法升级"})
+_FAIL_NO_MONEY = MappingProxyType({"success": False, "message": "金钱不足"})
+_FAIL_NO_MONEY_TAX = MappingProxyType({"success": False, "message": "金钱不足支付税款"})
+
 
 class PurchasePropertyCommand(Command):
     """购买房产命令"""
     
+    __slots__ = ("game_manager", "player", "cell", "original_owner", "purchase_price", "used_discount", "executed")
+    
     def __init__(self, game_manager, player: Player, cell: MapCell):
         self.game_manager = game_manager
         self.player = player
         self.cell = cell
         self.original_owner = cell.owner_id
         self.purchase_price = 0
+        self.used_discount: Optional[float] = None  # 本次购买消耗的折扣率，撤销时恢复
         self.executed = False
     
     def execute(self) -> Dict[str, Any]:
         """执行购买房产"""
         if self.executed:
-            return {"success": False, "message": "命令已执行"}
+            return _FAIL_CMD_EXECUTED
         
-        if self.cell.owner_id is not None:
-            return {"success": False, "message": "房产已有主人"}
+        player = self.player
+        cell = self.cell
+        
+        if cell.owner_id is not None:
+            return _FAIL_ALREADY_OWNED
         
         # 检查折扣效果
-        discount = 1.0
-        if self.player.id in self.game_manager.special_effects:
-            effects = self.game_manager.special_effects[self.player.id]
-            if "property_discount" in effects:
-                discount = effects["property_discount"]
+        gm = self.game_manager
+        flags = gm.effect_flags[player.id]
+        has_discount = flags & Effect.PROPERTY_DISCOUNT
+        discount = gm.effect_values[player.id].get(Effect.PROPERTY_DISCOUNT, 1.0) if has_discount else 1.0
         
-        self.purchase_price = int(self.cell.price * discount)
+        self.purchase_price = int(cell.price * discount)
         
-        if self.player.money < self.purchase_price:
-            return {"success": False, "message": "金钱不足"}
+        if player.money < self.purchase_price:
+            return _FAIL_NO_MONEY
         
-        # 执行购买
-        self.player.spend_money(self.purchase_price)
-        self.cell.owner_id = self.player.id
-        self.player.properties.append(self.cell.position)
+        # 执行购买（上面已检查余额，直接扣款）
+        player.money -= self.purchase_price
+        cell.owner_id = player.id
+        player.properties.add(cell.position)
         
         # 移除折扣效果
-        if self.player.id in self.game_manager.special_effects:
-            effects = self.game_manager.special_effects[self.player.id]
-            if "property_discount" in effects:
-                del effects["property_discount"]
+        if has_discount:
+            self.used_discount = gm.effect_values[player.id].pop(Effect.PROPERTY_DISCOUNT, 1.0)
+            gm.effect_flags[player.id] = flags & ~Effect.PROPERTY_DISCOUNT
+        else:
+            self.used_discount = None
         
         self.executed = True
         
-        message = f"{self.player.name} 购买了 {self.cell.name}，花费 {self.purchase_price} 金币"
+        message = f"{player.name} 购买了 {cell.name}，花费 {self.purchase_price} 金币"
         self.game_manager._log(message)
         self.game_manager.notify({"message": message, "type": "purchase"})
         
         return {
             "success": True,
             "message": message,
-            "player": self.player,
-            "cell": self.cell,
+            "player": player,
+            "cell": cell,
             "price": self.purchase_price
         }
     
     def undo(self) -> Dict[str, Any]:
         """撤销购买房产"""
         if not self.executed:
-            return {"success": False, "message": "命令未执行"}
+            return _FAIL_CMD_NOT_EXECUTED
         
         # 撤销购买
-        self.player.add_money(self.purchase_price)
+        self.player.money += self.purchase_price
         self.cell.owner_id = self.original_owner
-        if self.cell.position in self.player.properties:
-            self.player.properties.remove(self.cell.position)
+        self.player.properties.discard(self.cell.position)
+        
+        # 恢复购买时消耗的折扣效果
+        if self.used_discount is not None:
+            gm = self.game_manager
+            gm.effect_flags[self.player.id] |= Effect.PROPERTY_DISCOUNT
+            gm.effect_values[self.player.id][Effect.PROPERTY_DISCOUNT] = self.used_discount
+            self.used_discount = None
         
         self.executed = False
         
@@ -91,6 +113,8 @@ class PurchasePropertyCommand(Command):
 class UpgradePropertyCommand(Command):
     """升级房产命令"""
     
+    __slots__ = ("game_manager", "player", "cell", "original_level", "upgrade_cost", "executed")
+    
     def __init__(self, game_manager, player: Player, cell: MapCell):
         self.game_manager = game_manager
         self.player = player
@@ -102,44 +126,47 @@ class UpgradePropertyCommand(Command):
     def execute(self) -> Dict[str, Any]:
         """执行升级房产"""
         if self.executed:
-            return {"success": False, "message": "命令已执行"}
+            return _FAIL_CMD_EXECUTED
+        
+        player = self.player
+        cell = self.cell
         
-        if self.cell.owner_id != self.player.id:
-            return {"success": False, "message": "不是您的房产"}
+        if cell.owner_id != player.id:
+            return _FAIL_NOT_OWNER
         
-        if not self.cell.can_upgrade():
-            return {"success": False, "message": "房产无法升级"}
+        if not cell.can_upgrade():
+            return _FAIL_CANNOT_UPGRADE
         
-        self.upgrade_cost = self.cell.get_upgrade_cost()
+        self.upgrade_cost = cell.get_upgrade_cost()
         
-        if self.player.money < self.upgrade_cost:
-            return {"success": False, "message": "金钱不足"}
+        if player.money < self.upgrade_cost:
+            return _FAIL_NO_MONEY
         
         # 执行升级
-        self.player.spend_money(self.upgrade_cost)
-        self.cell.level = PropertyLevel(self.cell.level.value + 1)
+        player.money -= self.upgrade_cost
+        cell.upgrade()
         
         self.executed = True
         
-        message = f"{self.player.name} 升级了 {self.cell.name}，花费 {self.upgrade_cost} 金币"
+        message = f"{player.name} 升级了 {cell.name}，花费 {self.upgrade_cost} 金币"
         self.game_manager._log(message)
         self.game_manager.notify({"message": message, "type": "upgrade"})
         
         return {
             "success": True,
             "message": message,
-            "player": self.player,
-            "cell": self.cell,
+            "player": player,
+            "cell": cell,
             "cost": self.upgrade_cost
         }
     
     def undo(self) -> Dict[str, Any]:
         """撤销升级房产"""
         if not self.executed:
-            return {"success": False, "message": "命令未执行"}
+            return _FAIL_CMD_NOT_EXECUTED
         
         # 撤销升级
-        self.player.add_money(self.upgrade_cost)
+        self.player.money += self.upgrade_cost
         self.cell.level = self.original_level
         
         self.executed = False
@@ -162,6 +189,8 @@ class UpgradePropertyCommand(Command):
 class PayTaxCommand(Command):
     """交税命令"""
     
+    __slots__ = ("game_manager", "player", "cell", "tax_amount", "executed")
+    
     def __init__(self, game_manager, player: Player, cell: MapCell):
         self.game_manager = game_manager
         self.player = player
@@ -172,43 +201,44 @@ class PayTaxCommand(Command):
     def execute(self) -> Dict[str, Any]:
         """执行交税"""
         if self.executed:
-            return {"success": False, "message": "命令已执行"}
+            return _FAIL_CMD_EXECUTED
+        
+        player = self.player
+        cell = self.cell
         
         # 计算税额
-        if "所得税" in self.cell.name:
-            self.tax_amount = 200
-        elif "奢侈税" in self.cell.name:
-            self.tax_amount = 100
+        if cell.tax_fixed:
+            self.tax_amount = cell.tax_fixed
         else:
-            self.tax_amount = int(self.player.money * self.game_manager.config.tax_rate)
+            self.tax_amount = int(player.money * self.game_manager.config.tax_rate)
         
-        if self.player.money < self.tax_amount:
-            return {"success": False, "message": "金钱不足支付税款"}
+        if player.money < self.tax_amount:
+            return _FAIL_NO_MONEY_TAX
         
         # 执行交税
-        self.player.spend_money(self.tax_amount)
+        player.money -= self.tax_amount
         
         self.executed = True
         
-        message = f"{self.player.name} 支付了 {self.tax_amount} 金币的 {self.cell.name}"
+        message = f"{player.name} 支付了 {self.tax_amount} 金币的 {cell.name}"
         self.game_manager._log(message)
         self.game_manager.notify({"message": message, "type": "tax"})
         
         return {
             "success": True,
             "message": message,
-            "player": self.player,
+            "player": player,
             "tax_amount": self.tax_amount,
-            "tax_type": self.cell.name
+            "tax_type": cell.name
         }
     
     def undo(self) -> Dict[str, Any]:
         """撤销交税"""
         if not self.executed:
-            return {"success": False, "message": "命令未执行"}
+            return _FAIL_CMD_NOT_EXECUTED
         
         # 撤销交税
-        self.player.add_money(self.tax_amount)
+        self.player.money += self.tax_amount
         
         self.executed = False
         
@@ -230,6 +260,8 @@ class PayTaxCommand(Command):
 class MovePlayerCommand(Command):
     """移动玩家命令"""
     
+    __slots__ = ("game_manager", "player", "steps", "original_position", "start_bonus", "executed")
+    
     def __init__(self, game_manager, player: Player, steps: int):
         self.game_manager = game_manager
         self.player = player
@@ -241,29 +273,33 @@ class MovePlayerCommand(Command):
     def execute(self) -> Dict[str, Any]:
         """执行移动玩家"""
         if self.executed:
-            return {"success": False, "message": "命令已执行"}
+            return _FAIL_CMD_EXECUTED
+        
+        player = self.player
         
-        old_position = self.player.position
-        passed_start = self.player.move(self.steps, len(self.game_manager.map_cells))
+        old_position = player.position
+        board_size = len(self.game_manager.map_cells)
+        new_position, self.start_bonus = player.move(
+            self.steps, board_size, self.game_manager.config.start_bonus
+        )
         
-        # 经过起点获得奖励
-        if passed_start:
-            self.start_bonus = self.game_manager.config.start_bonus
-            self.player.add_money(self.start_bonus)
-            self.game_manager._log(f"{self.player.name} 经过起点，获得 {self.start_bonus} 金币")
+        # 经过起点获得奖励（是否经过起点与奖励金额无关，奖励为0时同样算经过）
+        passed_start = old_position + self.steps >= board_size
+        if self.start_bonus > 0:
+            self.game_manager._log(f"{player.name} 经过起点，获得 {self.start_bonus} 金币")
         
         self.executed = True
         
-        message = f"{self.player.name} 从位置 {old_position} 移动到位置 {self.player.position}"
+        message = f"{player.name} 从位置 {old_position} 移动到位置 {new_position}"
         self.game_manager._log(message)
         self.game_manager.notify({"message": message, "type": "move"})
         
         return {
             "success": True,
             "message": message,
-            "player": self.player,
+            "player": player,
             "old_position": old_position,
-            "new_position": self.player.position,
+            "new_position": new_position,
             "passed_start": passed_start,
             "start_bonus": self.start_bonus
         }
@@ -271,7 +307,7 @@ class MovePlayerCommand(Command):
     def undo(self) -> Dict[str, Any]:
         """撤销移动玩家"""
         if not self.executed:
-            return {"success": False, "message": "命令未执行"}
+            return _FAIL_CMD_NOT_EXECUTED
         
         # 撤销移动
         self.player.position = self.original_position
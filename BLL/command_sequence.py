@@ -0,0 +1,76 @@
+from typing import List, Dict, Any, Optional
+from .command_base import Command
+
+
+class SeqCommand(Command):
+    """组合命令 - 将一个回合内的多个命令作为一条历史记录执行和撤销"""
+    
+    __slots__ = ("game_manager", "subs", "messages", "executed")
+    
+    def __init__(self, game_manager, commands: Optional[List[Command]] = None):
+        self.game_manager = game_manager
+        self.subs: List[Command] = list(commands) if commands else []
+        self.messages: List[str] = []
+        self.executed = False
+    
+    def add(self, command: Command, result: Optional[Dict[str, Any]] = None):
+        """添加子命令；result 不为空表示该子命令已经执行过"""
+        self.subs.append(command)
+        if result is not None:
+            self.executed = True
+            if result.get("message"):
+                self.messages.append(result["message"])
+    
+    def execute(self) -> Dict[str, Any]:
+        """按顺序执行所有子命令，任一失败则回滚已执行的部分"""
+        if self.executed:
+            return {"success": False, "message": "命令已执行"}
+        
+        messages = []
+        with self.game_manager.batched():
+            for i, command in enumerate(self.subs):
+                result = command.execute()
+                if not result.get("success", False):
+                    self._rollback(i)
+                    return result
+                if result.get("message"):
+                    messages.append(result["message"])
+            
+            self.messages = messages
+            self.executed = True
+        
+        message = "\n".join(messages)
+        
+        return {
+            "success": True,
+            "message": message,
+            "count": len(self.subs)
+        }
+    
+    def undo(self) -> Dict[str, Any]:
+        """按相反顺序撤销所有子命令"""
+        if not self.executed:
+            return {"success": False, "message": "命令未执行"}
+        
+        with self.game_manager.batched():
+            for command in reversed(self.subs):
+                command.undo()
+        
+        self.executed = False
+        
+        message = f"撤销 {len(self.subs)} 个操作"
+        self.game_manager._log(message)
+        
+        return {
+            "success": True,
+            "message": message,
+            "count": len(self.subs)
+        }
+    
+    def _rollback(self, failed_index: int):
+        """撤销失败位置之前已执行的子命令"""
+        for command in reversed(self.subs[:failed_index]):
+            command.undo()
+    
+    def get_description(self) -> str:
+        return f"批量操作: {len(self.subs)} 个命令"
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Any, Deque, Iterator, Optional
 from .command_base import Command
 
 
@@ -6,8 +8,8 @@ class CommandInvoker:
     """命令调用者 - 命令模式"""
     
     def __init__(self, max_history: int = 10):
-        self.command_history: List[Command] = []
-        self.current_index = -1
+        self.undo_stack: Deque[Command] = deque(maxlen=max_history)
+        self.redo_stack: List[Command] = []
         self.max_history = max_history
     
     def execute_command(self, command: Command) -> Dict[str, Any]:
@@ -15,60 +17,63 @@ class CommandInvoker:
         result = command.execute()
         
         if result.get("success", False):
-            # 清除当前位置之后的历史记录
-            self.command_history = self.command_history[:self.current_index + 1]
-            
-            # 添加新命令到历史记录
-            self.command_history.append(command)
-            self.current_index += 1
-            
-            # 限制历史记录长度
-            if len(self.command_history) > self.max_history:
-                self.command_history.pop(0)
-                self.current_index -= 1
+            self.record(command)
         
         return result
     
+    def record(self, command: Command):
+        """记录一个已执行的命令"""
+        # 新命令使重做记录失效
+        self.redo_stack.clear()
+        
+        # 添加新命令到历史记录（超出长度时deque自动丢弃最旧的命令）
+        self.undo_stack.append(command)
+    
     def undo(self) -> Dict[str, Any]:
         """撤销上一个命令"""
-        if self.current_index < 0:
+        if not self.undo_stack:
             return {"success": False, "message": "没有可撤销的命令"}
         
-        command = self.command_history[self.current_index]
+        command = self.undo_stack.pop()
         result = command.undo()
         
         if result.get("success", False):
-            self.current_index -= 1
+            self.redo_stack.append(command)
+        else:
+            self.undo_stack.append(command)
         
         return result
     
     def redo(self) -> Dict[str, Any]:
         """重做下一个命令"""
-        if self.current_index >= len(self.command_history) - 1:
+        if not self.redo_stack:
             return {"success": False, "message": "没有可重做的命令"}
         
-        self.current_index += 1
-        command = self.command_history[self.current_index]
+        command = self.redo_stack.pop()
         result = command.execute()
         
-        if not result.get("success", False):
-            self.current_index -= 1
+        if result.get("success", False):
+            self.undo_stack.append(command)
+        else:
+            self.redo_stack.append(command)
         
         return result
     
-    def get_history(self) -> List[str]:
-        """获取命令历史描述"""
-        return [cmd.get_description() for cmd in self.command_history[:self.current_index + 1]]
+    def get_history(self, limit: Optional[int] = None) -> Iterator[str]:
+        """按时间顺序逐条生成命令历史描述，limit 指定时只生成最近的 limit 条"""
+        start = 0 if limit is None else max(0, len(self.undo_stack) - limit)
+        for cmd in islice(self.undo_stack, start, None):
+            yield cmd.get_description()
     
     def clear_history(self):
         """清空命令历史"""
-        self.command_history.clear()
-        self.current_index = -1
+        self.undo_stack.clear()
+        self.redo_stack.clear()
     
     def can_undo(self) -> bool:
         """检查是否可以撤销"""
-        return self.current_index >= 0
+        return bool(self.undo_stack)
     
     def can_redo(self) -> bool:
         """检查是否可以重做"""
-        return self.current_index < len(self.command_history) - 1
\ No newline at end of file
+        return bool(self.redo_stack)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Dict, Any, Optional
 import json
 import os
-from dataclasses import asdict
+from dataclasses import fields, replace
 from Model.models import GameConfig
 from DAL.database_manager import DatabaseManager
 
@@ -59,7 +59,7 @@ class ConfigManager:
         try:
             # 从数据库加载所有配置项
             config_data = {}
-            for key in self.default_config.__dict__.keys():
+            for key in (f.name for f in fields(GameConfig) if f.init):
                 value = self.db_manager.get_config(key)
                 if value is not None:
                     config_data[key] = value
@@ -85,7 +85,7 @@ class ConfigManager:
         """保存配置"""
         try:
             # 保存到数据库
-            config_dict = asdict(config)
+            config_dict = config.to_dict()
             self.db_manager.save_config(config_dict)
             
             # 保存到文件作为备份
@@ -107,8 +107,7 @@ class ConfigManager:
         try:
             config = self.load_config()
             if hasattr(config, key):
-                setattr(config, key, value)
-                return self.save_config(config)
+                return self.save_config(replace(config, **{key: value}))
             else:
                 print(f"配置项 {key} 不存在")
                 return False
@@ -237,7 +236,7 @@ class ConfigManager:
         """导出配置到文件"""
         try:
             config = self.load_config()
-            config_dict = asdict(config)
+            config_dict = config.to_dict()
             
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(config_dict, f, ensure_ascii=False, indent=2)
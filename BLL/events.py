@@ -1,27 +1,49 @@
 import random
-from typing import List, Dict, Any, Optional
-from abc import ABC, abstractmethod
-from Model.models import GameEvent, Player
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple, Callable, Protocol
+from Model.models import GameEvent, Player, Effect
 from .abstract_factory import GameFactoryManager
+
+
+# 事件模板缓存：同一游戏模式的所有对局共享同一份只读事件元组
+_CHANCE_CACHE: Dict[str, Tuple[GameEvent, ...]] = {}
+_MISFORTUNE_CACHE: Dict[str, Tuple[GameEvent, ...]] = {}
+
+
 class EventFactory:
     """事件工厂类"""
     
     @staticmethod
-    def create_chance_events(game_mode: str = "standard") -> List[GameEvent]:
-        """创建幸运事件列表"""       
-        # 使用抽象工厂模式
-        factory = GameFactoryManager.get_factory(game_mode)
-        return factory.create_chance_events()
-    
-
+    def create_chance_events(game_mode: str = "standard") -> Tuple[GameEvent, ...]:
+        """创建幸运事件列表（只读模板，需要修改时请先复制）"""
+        mode = game_mode.lower()
+        events = _CHANCE_CACHE.get(mode)
+        if events is None:
+            # 使用抽象工厂模式
+            factory = GameFactoryManager.get_factory(mode)
+            events = _CHANCE_CACHE[mode] = tuple(factory.create_chance_events())
+        return events
     
     @staticmethod
-    def create_misfortune_events(game_mode: str = "standard") -> List[GameEvent]:
-        """创建不幸事件列表"""       
-        # 使用抽象工厂模式
-        factory = GameFactoryManager.get_factory(game_mode)
-        return factory.create_misfortune_events()
+    def create_misfortune_events(game_mode: str = "standard") -> Tuple[GameEvent, ...]:
+        """创建不幸事件列表（只读模板，需要修改时请先复制）"""
+        mode = game_mode.lower()
+        events = _MISFORTUNE_CACHE.get(mode)
+        if events is None:
+            # 使用抽象工厂模式
+            factory = GameFactoryManager.get_factory(mode)
+            events = _MISFORTUNE_CACHE[mode] = tuple(factory.create_misfortune_events())
+        return events
     
+    @staticmethod
+    def clear_cache(game_mode: Optional[str] = None):
+        """清除事件模板缓存，未指定模式时全部清除"""
+        if game_mode is None:
+            _CHANCE_CACHE.clear()
+            _MISFORTUNE_CACHE.clear()
+        else:
+            _CHANCE_CACHE.pop(game_mode.lower(), None)
+            _MISFORTUNE_CACHE.pop(game_mode.lower(), None)
 
 
 class EventProcessor:
@@ -48,86 +70,116 @@ class EventProcessor:
             "effects": []
         }
         
-        effect = event.effect
-        
-        # 处理金钱变化
-        if "money" in effect:
-            amount = effect["money"]
-            if amount > 0:
-                player.add_money(amount)
-                result["effects"].append(f"获得 {amount} 金币")
-            else:
-                player.spend_money(abs(amount))
-                result["effects"].append(f"失去 {abs(amount)} 金币")
-        
-        # 处理生日事件
-        if "birthday" in effect:
-            amount_per_player = effect["birthday"]
-            total_received = 0
-            for other_player in all_players:
-                if other_player.id != player.id and not other_player.is_bankrupt:
-                    if other_player.spend_money(amount_per_player):
-                        total_received += amount_per_player
-            player.add_money(total_received)
-            result["effects"].append(f"从其他玩家处获得 {total_received} 金币")
-        
-        # 处理房屋维修
-        if "house_repair" in effect:
-            repair_cost = effect["house_repair"]
-            total_cost = len(player.properties) * repair_cost
-            player.spend_money(total_cost)
-            result["effects"].append(f"房屋维修费用 {total_cost} 金币")
-        
-        # 处理额外税收
-        if "tax_extra" in effect:
-            tax_rate = effect["tax_extra"]
-            tax_amount = int(player.money * tax_rate)
-            player.spend_money(tax_amount)
-            result["effects"].append(f"额外缴税 {tax_amount} 金币")
-        
-        # 处理进监狱
-        if "go_to_jail" in effect and effect["go_to_jail"]:
-            player.go_to_jail()
-            result["effects"].append("直接进监狱")
-        
-        # 处理后退
-        if "move_back" in effect:
-            steps = effect["move_back"]
-            player.position = max(0, player.position - steps)
-            result["effects"].append(f"后退 {steps} 步")
-        
-        # 处理道具
-        if "item" in effect:
-            item = effect["item"]
-            player.items.append(item)
-            result["effects"].append(f"获得道具: {item}")
-        
-        # 处理特殊效果（需要在游戏逻辑中处理）
-        if "free_move" in effect:
-            result["special_effect"] = "free_move"
-        
-        if "extra_turn" in effect:
-            result["special_effect"] = "extra_turn"
-        
-        if "discount" in effect:
-            result["special_effect"] = "property_discount"
-            result["discount_rate"] = effect["discount"]
+        for key, value in event.effect.items():
+            handler = _EFFECT_HANDLERS.get(key)
+            if handler:
+                handler(player, value, result, all_players)
         
         return result
 
-class EventObserver(ABC):
+
+# 事件效果处理函数，签名统一为 (玩家, 效果值, 结果字典, 所有玩家)
+def _handle_money(player: Player, amount: int, result: Dict[str, Any], all_players: List[Player]):
+    """处理金钱变化"""
+    if amount > 0:
+        player.add_money(amount)
+        result["effects"].append(f"获得 {amount} 金币")
+    else:
+        player.spend_money(abs(amount))
+        result["effects"].append(f"失去 {abs(amount)} 金币")
+
+
+def _handle_birthday(player: Player, amount_per_player: int, result: Dict[str, Any], all_players: List[Player]):
+    """处理生日事件"""
+    total_received = 0
+    player_id = player.id
+    for other_player in all_players:
+        # 循环内直接检查余额并扣款，省去每个玩家一次 spend_money 调用
+        if (other_player.id != player_id and not other_player.is_bankrupt and
+                other_player.money >= amount_per_player):
+            other_player.money -= amount_per_player
+            total_received += amount_per_player
+    player.money += total_received
+    result["effects"].append(f"从其他玩家处获得 {total_received} 金币")
+
+
+def _handle_house_repair(player: Player, repair_cost: int, result: Dict[str, Any], all_players: List[Player]):
+    """处理房屋维修"""
+    total_cost = len(player.properties) * repair_cost
+    player.spend_money(total_cost)
+    result["effects"].append(f"房屋维修费用 {total_cost} 金币")
+
+
+def _handle_tax_extra(player: Player, tax_rate: float, result: Dict[str, Any], all_players: List[Player]):
+    """处理额外税收"""
+    tax_amount = int(player.money * tax_rate)
+    player.spend_money(tax_amount)
+    result["effects"].append(f"额外缴税 {tax_amount} 金币")
+
+
+def _handle_go_to_jail(player: Player, enabled: bool, result: Dict[str, Any], all_players: List[Player]):
+    """处理进监狱"""
+    if enabled:
+        player.go_to_jail()
+        result["effects"].append("直接进监狱")
+
+
+def _handle_move_back(player: Player, steps: int, result: Dict[str, Any], all_players: List[Player]):
+    """处理后退"""
+    player.position = max(0, player.position - steps)
+    result["effects"].append(f"后退 {steps} 步")
+
+
+def _handle_item(player: Player, item: str, result: Dict[str, Any], all_players: List[Player]):
+    """处理道具"""
+    player.items.append(item)
+    result["effects"].append(f"获得道具: {item}")
+
+
+# 特殊效果（需要在游戏逻辑中处理）
+def _handle_free_move(player: Player, value: Any, result: Dict[str, Any], all_players: List[Player]):
+    result["special_effect"] = Effect.FREE_MOVE
+
+
+def _handle_extra_turn(player: Player, value: Any, result: Dict[str, Any], all_players: List[Player]):
+    result["special_effect"] = Effect.EXTRA_TURN
+
+
+def _handle_discount(player: Player, rate: float, result: Dict[str, Any], all_players: List[Player]):
+    result["special_effect"] = Effect.PROPERTY_DISCOUNT
+    result["discount_rate"] = rate
+
+
+_EFFECT_HANDLERS: Dict[str, Callable[[Player, Any, Dict[str, Any], List[Player]], None]] = {
+    "money": _handle_money,
+    "birthday": _handle_birthday,
+    "house_repair": _handle_house_repair,
+    "tax_extra": _handle_tax_extra,
+    "go_to_jail": _handle_go_to_jail,
+    "move_back": _handle_move_back,
+    "item": _handle_item,
+    "free_move": _handle_free_move,
+    "extra_turn": _handle_extra_turn,
+    "discount": _handle_discount,
+}
+
+class EventObserver(Protocol):
     """事件观察者接口 - 观察者模式"""
     
-    @abstractmethod
+    __slots__ = ()
+    
     def on_event_triggered(self, event_result: Dict[str, Any]):
         """事件触发时的回调"""
-        pass
+        ...
 
 class EventSubject:
     """事件主题类 - 观察者模式"""
     
+    __slots__ = ("_observers", "_queue")
+    
     def __init__(self):
         self._observers: List[EventObserver] = []
+        self._queue: Optional[List[Dict[str, Any]]] = None  # 批量通知队列
     
     def attach(self, observer: EventObserver):
         """添加观察者"""
@@ -139,6 +191,37 @@ class EventSubject:
             self._observers.remove(observer)
     
     def notify(self, event_result: Dict[str, Any]):
-        """通知所有观察者"""
+        """通知所有观察者；没有观察者时直接返回"""
+        if not self._observers:
+            return
+        if self._queue is not None:
+            self._queue.append(event_result)
+            return
         for observer in self._observers:
-            observer.on_event_triggered(event_result)
\ No newline at end of file
+            observer.on_event_triggered(event_result)
+    
+    def notify_batch(self, events: List[Dict[str, Any]]):
+        """将多条事件合并为一次通知"""
+        if not events or not self._observers:
+            return
+        batch = {
+            "type": "batch",
+            "message": "\n".join(e["message"] for e in events if e.get("message")),
+            "events": events
+        }
+        for observer in self._observers:
+            observer.on_event_triggered(batch)
+    
+    @contextmanager
+    def batched(self):
+        """在 with 块内暂存通知，退出时统一发送；嵌套使用时由最外层发送"""
+        if self._queue is not None:
+            yield
+            return
+        
+        self._queue = []
+        try:
+            yield
+        finally:
+            queue, self._queue = self._queue, None
+            self.notify_batch(queue)
\ No newline at end of file
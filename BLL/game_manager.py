@@ -3,17 +3,28 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import threading
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
 
 from Model.models import (
     Player, MapCell, GameState, GameConfig, PlayerType, 
-    CellType, PropertyLevel
+    CellType, PropertyLevel, Effect, build_type_index,
+    player_from_dict, map_cell_from_dict
 )
 from .events import EventProcessor, EventSubject
 from .ai_strategy_base import AIPlayer, AIStrategyFactory
 from .commands import CommandInvoker
+from .command_sequence import SeqCommand
 from .command_implementations import PurchasePropertyCommand, UpgradePropertyCommand, PayTaxCommand, MovePlayerCommand
 from DAL.database_manager import DatabaseManager
 
+# 回合进行中撤销/重做的失败结果，以只读映射共享
+_FAIL_TURN_IN_PROGRESS = MappingProxyType({"success": False, "message": "回合进行中，结束回合后才能撤销或重做"})
+
 class GameManager(EventSubject):
     """游戏管理器 - 单例模式"""
     _instance = None
@@ -34,15 +45,18 @@ class GameManager(EventSubject):
             self.players: List[Player] = []
             self.ai_players: Dict[int, AIPlayer] = {}
             self.map_cells: List[MapCell] = []
+            self.cells_by_type: Dict[CellType, Tuple[MapCell, ...]] = {}  # 按类型分组的地图格子
             self.current_player_index = 0
             self.game_state = GameState.WAITING
             self.turn_count = 0
             self.event_processor = EventProcessor()
             self.game_log: List[str] = []
-            self.special_effects: Dict[int, Dict[str, Any]] = {}  # 玩家特殊效果
+            self.effect_flags: List[int] = [0]  # 玩家特殊效果位标志，按玩家ID索引（0号位不使用）
+            self.effect_values: List[Dict[Effect, float]] = [{}]  # 带数值的特殊效果（如折扣率）
             self.last_dice_result: Optional[Tuple[int, int, int]] = None  # 最后一次骰子结果
             self.last_save_name = None  # 记录上次保存的存档名称
             self.command_invoker = CommandInvoker()  # 命令调用器
+            self._batch: Optional[SeqCommand] = None  # 当前回合的组合命令
             self.initialized = True
             self._load_map_data()
     
@@ -94,6 +108,7 @@ class GameManager(EventSubject):
         
         # 按位置排序
         self.map_cells.sort(key=lambda x: x.position)
+        self.cells_by_type = build_type_index(self.map_cells)
     
     def create_player(self, name: str, player_type: PlayerType, 
                      avatar: str = "default", ai_difficulty: str = "medium") -> Player:
@@ -111,6 +126,7 @@ class GameManager(EventSubject):
         )
         
         self.players.append(player)
+        self._ensure_effect_slot(player_id)
         
         # 如果是AI玩家，创建AI控制器
         if player_type == PlayerType.AI:
@@ -120,6 +136,22 @@ class GameManager(EventSubject):
         self._log(f"玩家 {name} 加入游戏")
         return player
     
+    def _ensure_effect_slot(self, player_id: int):
+        """保证特殊效果数组覆盖指定玩家ID"""
+        while len(self.effect_flags) <= player_id:
+            self.effect_flags.append(0)
+            self.effect_values.append({})
+    
+    def _apply_special_effect(self, player: Player, event_result: Dict[str, Any]):
+        """记录事件带来的特殊效果"""
+        # 目前只有购房折扣会被游戏逻辑消耗，其余效果不记录，避免标志只增不减并写入存档
+        effect = event_result.get("special_effect", 0) & Effect.PROPERTY_DISCOUNT
+        if not effect:
+            return
+        self.effect_flags[player.id] |= effect
+        if effect & Effect.PROPERTY_DISCOUNT:
+            self.effect_values[player.id][Effect.PROPERTY_DISCOUNT] = event_result.get("discount_rate", 1.0)
+    
     def start_game(self) -> bool:
         """开始游戏"""
         if len(self.players) < 2:
@@ -155,8 +187,7 @@ class GameManager(EventSubject):
     def move_player(self, player: Player, steps: int) -> Dict[str, Any]:
         """移动玩家 - 使用命令模式"""
         command = MovePlayerCommand(self, player, steps)
-        result = self.command_invoker.execute_command(command)
-        return result
+        return self._execute_command(command)
     
     def get_cell_at_position(self, position: int) -> Optional[MapCell]:
         """获取指定位置的地图格子"""
@@ -243,10 +274,12 @@ class GameManager(EventSubject):
                     "message": "使用免租卡，免除租金"
                 }
             
-            player.spend_money(rent)
+            # 余额不足时不扣款（与 spend_money 行为一致），房主照常收租
+            if player.money >= rent:
+                player.money -= rent
             owner = self.get_player_by_id(cell.owner_id)
             if owner:
-                owner.add_money(rent)
+                owner.money += rent
             
             return {
                 "type": "rent_paid",
@@ -270,6 +303,7 @@ class GameManager(EventSubject):
         """处理幸运格子"""
         event = self.event_processor.get_random_chance_event()
         event_result = self.event_processor.process_event(event, player, self.players)
+        self._apply_special_effect(player, event_result)
         
         # 通知观察者
         self.notify(event_result)
@@ -283,6 +317,7 @@ class GameManager(EventSubject):
         """处理不幸格子"""
         event = self.event_processor.get_random_misfortune_event()
         event_result = self.event_processor.process_event(event, player, self.players)
+        self._apply_special_effect(player, event_result)
         
         # 通知观察者
         self.notify(event_result)
@@ -295,7 +330,7 @@ class GameManager(EventSubject):
     def _handle_tax_landing(self, player: Player, cell: MapCell) -> Dict[str, Any]:
         """处理税务格子 - 使用命令模式"""
         command = PayTaxCommand(self, player, cell)
-        result = self.command_invoker.execute_command(command)
+        result = self._execute_command(command)
         
         if result.get("success", False):
             return {
@@ -324,13 +359,13 @@ class GameManager(EventSubject):
     def purchase_property(self, player: Player, cell: MapCell) -> bool:
         """购买房产 - 使用命令模式"""
         command = PurchasePropertyCommand(self, player, cell)
-        result = self.command_invoker.execute_command(command)
+        result = self._execute_command(command)
         return result.get("success", False)
     
     def upgrade_property(self, player: Player, cell: MapCell) -> bool:
         """升级房产 - 使用命令模式"""
         command = UpgradePropertyCommand(self, player, cell)
-        result = self.command_invoker.execute_command(command)
+        result = self._execute_command(command)
         return result.get("success", False)
     
     def get_player_by_id(self, player_id: int) -> Optional[Player]:
@@ -340,25 +375,53 @@ class GameManager(EventSubject):
                 return player
         return None
     
+    def _execute_command(self, command) -> Dict[str, Any]:
+        """执行命令；批量模式下加入当前组合命令而不是直接写入历史"""
+        if self._batch is None:
+            return self.command_invoker.execute_command(command)
+        
+        result = command.execute()
+        if result.get("success", False):
+            self._batch.add(command, result)
+        return result
+    
+    def begin_batch(self):
+        """开始批量记录，之后的命令合并为一条历史记录"""
+        if self._batch is None:
+            self._batch = SeqCommand(self)
+    
+    def end_batch(self) -> Optional[SeqCommand]:
+        """结束批量记录，将组合命令作为一条记录写入历史"""
+        batch, self._batch = self._batch, None
+        if batch is None or not batch.subs:
+            return None
+        
+        self.command_invoker.record(batch)
+        return batch
+    
     def undo_last_action(self) -> Dict[str, Any]:
-        """撤销上一个操作"""
+        """撤销上一个操作；回合进行中（批量记录未结束）时不允许撤销"""
+        if self._batch is not None:
+            return _FAIL_TURN_IN_PROGRESS
         return self.command_invoker.undo()
     
     def redo_last_action(self) -> Dict[str, Any]:
-        """重做上一个操作"""
+        """重做上一个操作；回合进行中时不允许重做"""
+        if self._batch is not None:
+            return _FAIL_TURN_IN_PROGRESS
         return self.command_invoker.redo()
     
-    def get_command_history(self) -> List[str]:
+    def get_command_history(self, limit: Optional[int] = None) -> List[str]:
         """获取命令历史"""
-        return self.command_invoker.get_command_history()
+        return list(self.command_invoker.get_history(limit))
     
     def can_undo(self) -> bool:
         """是否可以撤销"""
-        return self.command_invoker.can_undo()
+        return self._batch is None and self.command_invoker.can_undo()
     
     def can_redo(self) -> bool:
         """是否可以重做"""
-        return self.command_invoker.can_redo()
+        return self._batch is None and self.command_invoker.can_redo()
     
     def clear_command_history(self):
         """清空命令历史"""
@@ -445,11 +508,19 @@ class GameManager(EventSubject):
             "game_state": self.game_state.value,
             "turn_count": self.turn_count,
             "ai_players": {str(k): v.get_difficulty() for k, v in self.ai_players.items()},
-            "special_effects": self.special_effects,
+            "special_effects": {
+                str(pid): {"flags": int(flags), "values": {e.name: v for e, v in self.effect_values[pid].items()}}
+                for pid, flags in enumerate(self.effect_flags) if flags
+            },
             "save_timestamp": datetime.now().isoformat()
         }
         
-        result = self.db_manager.save_game(save_name, json.dumps(game_data))
+        # 存档字段为文本，orjson 输出 UTF-8 字节后解码为字符串
+        if orjson is not None:
+            game_data_str = orjson.dumps(game_data).decode('utf-8')
+        else:
+            game_data_str = json.dumps(game_data)
+        result = self.db_manager.save_game(save_name, game_data_str)
         if result:
             self.last_save_name = save_name  # 记录成功保存的存档名称
         return result
@@ -467,22 +538,34 @@ class GameManager(EventSubject):
             return False
         
         try:
-            game_data = json.loads(game_data_str)
+            game_data = orjson.loads(game_data_str) if orjson is not None else json.loads(game_data_str)
             
             # 恢复配置
             self.config = GameConfig.from_dict(game_data["config"])
             
             # 恢复玩家
-            self.players = [Player.from_dict(p) for p in game_data["players"]]
+            self.players = [player_from_dict(p) for p in game_data["players"]]
             
             # 恢复地图
-            self.map_cells = [MapCell.from_dict(c) for c in game_data["map_cells"]]
+            self.map_cells = [map_cell_from_dict(c) for c in game_data["map_cells"]]
+            self.cells_by_type = build_type_index(self.map_cells)
             
             # 恢复游戏状态
             self.current_player_index = game_data["current_player_index"]
             self.game_state = GameState(game_data["game_state"])
             self.turn_count = game_data["turn_count"]
-            self.special_effects = game_data.get("special_effects", {})
+            self._batch = None  # 丢弃加载前未结束的回合记录
+            
+            # 恢复特殊效果
+            self.effect_flags = [0]
+            self.effect_values = [{}]
+            for player in self.players:
+                self._ensure_effect_slot(player.id)
+            for pid, data in game_data.get("special_effects", {}).items():
+                pid = int(pid)
+                if pid < len(self.effect_flags) and isinstance(data, dict) and "flags" in data:
+                    self.effect_flags[pid] = data["flags"]
+                    self.effect_values[pid] = {Effect[name]: v for name, v in data.get("values", {}).items()}
             
             # 恢复AI玩家
             self.ai_players = {}
@@ -529,7 +612,9 @@ class GameManager(EventSubject):
         self.game_state = GameState.WAITING
         self.turn_count = 0
         self.game_log.clear()
-        self.special_effects.clear()
+        self.effect_flags = [0]
+        self.effect_values = [{}]
+        self._batch = None
         self.last_save_name = None  # 清除上次保存的存档名称
         self._load_map_data()  # 重新加载地图数据
         self._log("游戏已重置")
\ No newline at end of file
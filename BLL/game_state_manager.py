@@ -35,7 +35,7 @@ class GameStateManager:
                 "game_version": "1.0.0",
                 "save_format_version": "1.0"
             },
-            "game_config": asdict(self.game_manager.config),
+            "game_config": self.game_manager.config.to_dict(),
             "game_state": {
                 "current_state": self.game_manager.game_state.value,
                 "current_player_index": self.game_manager.current_player_index,
@@ -1,13 +1,49 @@
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Set, Callable, Mapping
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from collections import defaultdict
+import heapq
+from operator import attrgetter
 import json
 import os
-from Model.models import Player, GameState
-from DAL.database_manager import DatabaseManager
+import time
+from types import MappingProxyType
+from Model.models import Player, GameState, PlayerType, generate_dict_builder
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+
+def _write_json(file_path: str, data: Dict[str, Any]):
+    """将数据写入 JSON 文件，优先使用 orjson"""
+    # 先在内存中完成编码再一次性写入，避免 json.dump 逐个片段调用 write
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+    with open(file_path, 'wb') as f:
+        f.write(payload)
+
+
+def _read_json(file_path: str) -> Any:
+    """读取 JSON 文件，优先使用 orjson"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _generate_to_dict(cls):
+    """为统计数据类挂载按字段生成的 to_dict 方法"""
+    to_dict = generate_dict_builder(cls)
+    to_dict.__doc__ = "转换为字典"
+    cls.to_dict = to_dict
+    return cls
+
+
+@_generate_to_dict
+@dataclass(slots=True)
 class PlayerStatistics:
     """玩家统计数据"""
     player_name: str
@@ -29,13 +65,14 @@ class PlayerStatistics:
     average_game_duration: float = 0.0
     longest_game: float = 0.0
     shortest_game: float = 0.0
-    favorite_properties: List[str] = None
+    favorite_properties: Set[str] = field(default_factory=set)
     win_rate: float = 0.0
     average_money_per_game: float = 0.0
     
     def __post_init__(self):
-        if self.favorite_properties is None:
-            self.favorite_properties = []
+        if not isinstance(self.favorite_properties, set):
+            # 从 JSON 加载时为列表
+            self.favorite_properties = set(self.favorite_properties)
     
     def calculate_derived_stats(self):
         """计算派生统计数据"""
@@ -43,14 +80,15 @@ class PlayerStatistics:
             self.win_rate = self.games_won / self.games_played
             self.average_money_per_game = self.total_money_earned / self.games_played
 
-@dataclass
+@_generate_to_dict
+@dataclass(slots=True)
 class GameStatistics:
     """游戏统计数据"""
     game_id: str
     start_time: datetime
     end_time: Optional[datetime] = None
     duration: float = 0.0
-    players: List[str] = None
+    players: List[str] = field(default_factory=list)
     winner: Optional[str] = None
     total_turns: int = 0
     total_transactions: int = 0
@@ -65,88 +103,193 @@ class GameStatistics:
     human_players: int = 0
     game_mode: str = "standard"
     difficulty: str = "medium"
-    
-    def __post_init__(self):
-        if self.players is None:
-            self.players = []
+    start_ns: int = 0  # 单调时钟时间戳，用于计算时长，不受系统时间调整影响
+    end_ns: int = 0
     
     def calculate_duration(self):
         """计算游戏时长"""
-        if self.end_time and self.start_time:
+        if self.end_ns and self.start_ns:
+            self.duration = (self.end_ns - self.start_ns) / 6e10  # 分钟
+        elif self.end_time and self.start_time:
             self.duration = (self.end_time - self.start_time).total_seconds() / 60  # 分钟
 
+# 排行榜排序键
+_LEADERBOARD_KEYS = {
+    "win_rate": attrgetter("win_rate"),
+    "games_won": attrgetter("games_won"),
+    "games_played": attrgetter("games_played"),
+    "total_money_earned": attrgetter("total_money_earned"),
+    "average_money_per_game": attrgetter("average_money_per_game"),
+}
+
+# 交易处理函数，签名统一为 (玩家统计, 当前游戏统计, 金额)
+def _txn_property_purchase(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.properties_bought += 1
+    player_stat.total_money_spent += amount
+
+
+def _txn_property_sale(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.properties_sold += 1
+    player_stat.total_money_earned += amount
+    game_stat.properties_traded += 1
+
+
+def _txn_rent_payment(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.rent_paid += amount
+    player_stat.total_money_spent += amount
+
+
+def _txn_rent_collection(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.rent_collected += amount
+    player_stat.total_money_earned += amount
+
+
+def _txn_tax_payment(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.tax_paid += amount
+    player_stat.total_money_spent += amount
+
+
+def _txn_money_earned(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.total_money_earned += amount
+
+
+def _txn_money_spent(player_stat: PlayerStatistics, game_stat: GameStatistics, amount: int):
+    player_stat.total_money_spent += amount
+
+
+_TXN_HANDLERS: Dict[str, Callable[[PlayerStatistics, GameStatistics, int], None]] = {
+    "property_purchase": _txn_property_purchase,
+    "property_sale": _txn_property_sale,
+    "rent_payment": _txn_rent_payment,
+    "rent_collection": _txn_rent_collection,
+    "tax_payment": _txn_tax_payment,
+    "lucky_bonus": _txn_money_earned,
+    "unlucky_penalty": _txn_money_spent,
+}
+
+
+# 事件处理函数，签名统一为 (玩家统计, 当前游戏统计)
+def _event_jail_visit(player_stat: PlayerStatistics, game_stat: GameStatistics):
+    player_stat.jail_visits += 1
+    game_stat.jail_visits += 1
+
+
+def _event_hospital_visit(player_stat: PlayerStatistics, game_stat: GameStatistics):
+    player_stat.hospital_visits += 1
+    game_stat.hospital_visits += 1
+
+
+def _event_lucky(player_stat: PlayerStatistics, game_stat: GameStatistics):
+    player_stat.lucky_events += 1
+    game_stat.lucky_events_triggered += 1
+
+
+def _event_unlucky(player_stat: PlayerStatistics, game_stat: GameStatistics):
+    player_stat.unlucky_events += 1
+    game_stat.unlucky_events_triggered += 1
+
+
+def _event_turn_completed(player_stat: PlayerStatistics, game_stat: GameStatistics):
+    game_stat.total_turns += 1
+
+
+_EVENT_HANDLERS: Dict[str, Callable[[PlayerStatistics, GameStatistics], None]] = {
+    "jail_visit": _event_jail_visit,
+    "hospital_visit": _event_hospital_visit,
+    "lucky_event": _event_lucky,
+    "unlucky_event": _event_unlucky,
+    "turn_completed": _event_turn_completed,
+}
+
 class StatisticsManager:
     """统计管理器"""
     
+    FLUSH_INTERVAL = 30.0  # 两次写盘之间的最小间隔（秒）
+    
     def __init__(self):
-        self.db_manager = DatabaseManager()
         self.stats_file = "game_statistics.json"
         self.current_game_stats: Optional[GameStatistics] = None
         self.player_stats: Dict[str, PlayerStatistics] = {}
+        self._player_stats_view = MappingProxyType(self.player_stats)  # 只读视图，随 player_stats 同步变化
         self.session_stats = defaultdict(int)
+        self._dirty: Set[str] = set()  # 派生统计需要重新计算的玩家
+        self._current_game_cache: Optional[Dict[str, Any]] = None  # 当前游戏统计的序列化结果
+        self._current_game_dirty = True
+        self._dirty_disk = False  # 是否有尚未写盘的统计数据
+        self._last_flush = time.monotonic()
         self.load_statistics()
     
     def load_statistics(self):
-        """加载统计数据"""
+        """从统计文件加载统计数据"""
         try:
-            # 从数据库加载
-            stats_data = self.db_manager.get_statistics()
-            if stats_data:
-                self._parse_statistics_data(stats_data)
-            
-            # 从文件加载作为备份
             if os.path.exists(self.stats_file):
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    file_data = json.load(f)
-                    self._merge_statistics_data(file_data)
+                self._parse_statistics_data(_read_json(self.stats_file))
         except Exception as e:
             print(f"加载统计数据失败: {e}")
     
-    def save_statistics(self):
-        """保存统计数据"""
+    def save_statistics(self, force: bool = False):
+        """保存统计数据；默认距上次写盘不足 FLUSH_INTERVAL 时只做标记，由后续调用或退出时的 flush 写入"""
+        self._dirty_disk = True
+        if force or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        """将尚未写盘的统计数据写入统计文件"""
+        if not self._dirty_disk:
+            return
+        self._dirty_disk = False
+        self._last_flush = time.monotonic()
         try:
             stats_data = self._serialize_statistics()
             
-            # 保存到数据库
-            self.db_manager.save_statistics(stats_data)
-            
-            # 保存到文件作为备份
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats_data, f, ensure_ascii=False, indent=2, default=str)
+            # 先写临时文件再原子替换，避免写到一半的文件覆盖旧数据
+            tmp_file = self.stats_file + ".tmp"
+            _write_json(tmp_file, stats_data)
+            os.replace(tmp_file, self.stats_file)
         except Exception as e:
             print(f"保存统计数据失败: {e}")
     
     def start_game_tracking(self, game_id: str, players: List[Player], 
                           game_mode: str = "standard", difficulty: str = "medium"):
         """开始游戏跟踪"""
-        player_names = [player.name for player in players]
-        ai_count = sum(1 for player in players if player.is_ai)
+        # 单次遍历收集玩家名并统计AI玩家数量
+        player_names = []
+        ai_count = 0
+        for player in players:
+            player_names.append(player.name)
+            if player.player_type == PlayerType.AI:
+                ai_count += 1
         human_count = len(players) - ai_count
         
         self.current_game_stats = GameStatistics(
             game_id=game_id,
             start_time=datetime.now(),
+            start_ns=time.monotonic_ns(),
             players=player_names,
             ai_players=ai_count,
             human_players=human_count,
             game_mode=game_mode,
             difficulty=difficulty
         )
+        self._current_game_dirty = True
         
         # 初始化玩家统计
         for player_name in player_names:
             if player_name not in self.player_stats:
                 self.player_stats[player_name] = PlayerStatistics(player_name=player_name)
             self.player_stats[player_name].games_played += 1
+            self._dirty.add(player_name)
     
     def end_game_tracking(self, winner: Optional[str], final_players: List[Player]):
         """结束游戏跟踪"""
         if not self.current_game_stats:
             return
         
+        self.current_game_stats.end_ns = time.monotonic_ns()
         self.current_game_stats.end_time = datetime.now()
         self.current_game_stats.calculate_duration()
         self.current_game_stats.winner = winner
+        self._current_game_dirty = True
         
         # 更新玩家统计
         for player in final_players:
@@ -171,10 +314,11 @@ class StatisticsManager:
                 total_duration = player_stat.average_game_duration * (player_stat.games_played - 1) + duration
                 player_stat.average_game_duration = total_duration / player_stat.games_played
                 
-                player_stat.calculate_derived_stats()
+                self._dirty.add(player.name)
         
         self.save_statistics()
         self.current_game_stats = None
+        self._current_game_dirty = True
     
     def record_transaction(self, transaction_type: str, player_name: str, 
                          amount: int, details: Dict[str, Any] = None):
@@ -182,39 +326,22 @@ class StatisticsManager:
         if not self.current_game_stats:
             return
         
+        self._current_game_dirty = True
         self.current_game_stats.total_transactions += 1
         self.current_game_stats.total_money_circulated += abs(amount)
         
         player_stat = self.player_stats.get(player_name)
         if not player_stat:
             return
+        self._dirty.add(player_name)
         
-        if transaction_type == "property_purchase":
-            player_stat.properties_bought += 1
-            player_stat.total_money_spent += amount
-        elif transaction_type == "property_sale":
-            player_stat.properties_sold += 1
-            player_stat.total_money_earned += amount
-            self.current_game_stats.properties_traded += 1
-        elif transaction_type == "rent_payment":
-            player_stat.rent_paid += amount
-            player_stat.total_money_spent += amount
-        elif transaction_type == "rent_collection":
-            player_stat.rent_collected += amount
-            player_stat.total_money_earned += amount
-        elif transaction_type == "tax_payment":
-            player_stat.tax_paid += amount
-            player_stat.total_money_spent += amount
-        elif transaction_type == "lucky_bonus":
-            player_stat.total_money_earned += amount
-        elif transaction_type == "unlucky_penalty":
-            player_stat.total_money_spent += amount
+        handler = _TXN_HANDLERS.get(transaction_type)
+        if handler:
+            handler(player_stat, self.current_game_stats, amount)
         
         # 记录最喜欢的房产
         if details and "property_name" in details:
-            property_name = details["property_name"]
-            if property_name not in player_stat.favorite_properties:
-                player_stat.favorite_properties.append(property_name)
+            player_stat.favorite_properties.add(details["property_name"])
     
     def record_event(self, event_type: str, player_name: str, details: Dict[str, Any] = None):
         """记录事件"""
@@ -224,82 +351,67 @@ class StatisticsManager:
         player_stat = self.player_stats.get(player_name)
         if not player_stat:
             return
+        self._dirty.add(player_name)
+        self._current_game_dirty = True
         
-        if event_type == "jail_visit":
-            player_stat.jail_visits += 1
-            self.current_game_stats.jail_visits += 1
-        elif event_type == "hospital_visit":
-            player_stat.hospital_visits += 1
-            self.current_game_stats.hospital_visits += 1
-        elif event_type == "lucky_event":
-            player_stat.lucky_events += 1
-            self.current_game_stats.lucky_events_triggered += 1
-        elif event_type == "unlucky_event":
-            player_stat.unlucky_events += 1
-            self.current_game_stats.unlucky_events_triggered += 1
-        elif event_type == "turn_completed":
-            self.current_game_stats.total_turns += 1
+        handler = _EVENT_HANDLERS.get(event_type)
+        if handler:
+            handler(player_stat, self.current_game_stats)
     
     def get_player_statistics(self, player_name: str) -> Optional[PlayerStatistics]:
         """获取玩家统计"""
         return self.player_stats.get(player_name)
     
-    def get_all_player_statistics(self) -> Dict[str, PlayerStatistics]:
-        """获取所有玩家统计"""
-        return self.player_stats.copy()
+    def get_all_player_statistics(self) -> Mapping[str, PlayerStatistics]:
+        """获取所有玩家统计（只读视图，需要独立副本时请自行 dict(...)）"""
+        return self._player_stats_view
     
     def get_leaderboard(self, sort_by: str = "win_rate", limit: int = 10) -> List[PlayerStatistics]:
         """获取排行榜"""
-        players = list(self.player_stats.values())
+        # 计算派生统计
+        self._update_derived_stats()
         
         # 只包含至少玩过一局的玩家
-        players = [p for p in players if p.games_played > 0]
-        
-        # 计算派生统计
-        for player in players:
-            player.calculate_derived_stats()
+        players = [p for p in self.player_stats.values() if p.games_played > 0]
         
-        # 排序
-        if sort_by == "win_rate":
-            players.sort(key=lambda p: p.win_rate, reverse=True)
-        elif sort_by == "games_won":
-            players.sort(key=lambda p: p.games_won, reverse=True)
-        elif sort_by == "games_played":
-            players.sort(key=lambda p: p.games_played, reverse=True)
-        elif sort_by == "total_money_earned":
-            players.sort(key=lambda p: p.total_money_earned, reverse=True)
-        elif sort_by == "average_money_per_game":
-            players.sort(key=lambda p: p.average_money_per_game, reverse=True)
+        # 只取前 limit 名，无需对全部玩家排序；结果与稳定排序后切片一致
+        sort_key = _LEADERBOARD_KEYS.get(sort_by)
+        if sort_key:
+            return heapq.nlargest(limit, players, key=sort_key)
         
         return players[:limit]
     
     def get_game_summary(self) -> Dict[str, Any]:
         """获取游戏总结"""
-        total_games = len([p for p in self.player_stats.values() if p.games_played > 0])
         total_players = len(self.player_stats)
         
         if total_players == 0:
             return {"message": "暂无游戏数据"}
         
-        # 计算总体统计
-        total_money_circulated = sum(p.total_money_earned + p.total_money_spent 
-                                   for p in self.player_stats.values())
-        total_properties_traded = sum(p.properties_bought + p.properties_sold 
-                                    for p in self.player_stats.values())
-        total_jail_visits = sum(p.jail_visits for p in self.player_stats.values())
-        total_hospital_visits = sum(p.hospital_visits for p in self.player_stats.values())
+        self._update_derived_stats()
         
-        # 找出最活跃的玩家
-        most_active = max(self.player_stats.values(), key=lambda p: p.games_played)
+        # 单次遍历计算总体统计，同时找出最活跃的玩家和胜率最高的玩家（至少玩过3局）
+        total_games = 0
+        total_money_circulated = 0
+        total_properties_traded = 0
+        total_jail_visits = 0
+        total_hospital_visits = 0
+        most_active = None
+        highest_win_rate = None
         
-        # 找出胜率最高的玩家（至少玩过3局）
-        eligible_players = [p for p in self.player_stats.values() if p.games_played >= 3]
-        if eligible_players:
-            for p in eligible_players:
-                p.calculate_derived_stats()
-            highest_win_rate = max(eligible_players, key=lambda p: p.win_rate)
-        else:
-            highest_win_rate = None
+        for p in self.player_stats.values():
+            games_played = p.games_played
+            if games_played > 0:
+                total_games += 1
+            total_money_circulated += p.total_money_earned + p.total_money_spent
+            total_properties_traded += p.properties_bought + p.properties_sold
+            total_jail_visits += p.jail_visits
+            total_hospital_visits += p.hospital_visits
+            
+            if most_active is None or games_played > most_active.games_played:
+                most_active = p
+            if games_played >= 3 and (highest_win_rate is None or p.win_rate > highest_win_rate.win_rate):
+                highest_win_rate = p
         
         return {
             "总体统计": {
@@ -337,24 +449,24 @@ class StatisticsManager:
             stats_data = self._serialize_statistics()
             
             if format_type.lower() == "json":
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(stats_data, f, ensure_ascii=False, indent=2, default=str)
+                _write_json(file_path, stats_data)
             elif format_type.lower() == "csv":
                 import csv
                 with open(file_path, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.writer(f)
                     # 写入玩家统计数据
                     writer.writerow(["玩家名", "游戏数", "胜利数", "胜率", "总收入", "总支出"])
-                    for player_stat in self.player_stats.values():
-                        player_stat.calculate_derived_stats()
-                        writer.writerow([
+                    writer.writerows(
+                        (
                             player_stat.player_name,
                             player_stat.games_played,
                             player_stat.games_won,
                             f"{player_stat.win_rate:.2%}",
                             player_stat.total_money_earned,
                             player_stat.total_money_spent
-                        ])
+                        )
+                        for player_stat in self.player_stats.values()
+                    )
             
             return True
         except Exception as e:
@@ -372,18 +484,36 @@ class StatisticsManager:
                 # 重置所有统计
                 self.player_stats.clear()
                 self.current_game_stats = None
+                self._current_game_dirty = True
             
-            self.save_statistics()
+            self.save_statistics(force=True)
             return True
         except Exception as e:
             print(f"重置统计数据失败: {e}")
             return False
     
+    def _update_derived_stats(self):
+        """只为数据发生变化的玩家重新计算派生统计"""
+        if not self._dirty:
+            return
+        for name in self._dirty:
+            player_stat = self.player_stats.get(name)
+            if player_stat:
+                player_stat.calculate_derived_stats()
+        self._dirty.clear()
+    
     def _serialize_statistics(self) -> Dict[str, Any]:
         """序列化统计数据"""
+        self._update_derived_stats()
+        
+        # 当前游戏统计未变化时复用上次的序列化结果
+        if self._current_game_dirty:
+            self._current_game_cache = self.current_game_stats.to_dict() if self.current_game_stats else None
+            self._current_game_dirty = False
+        
         return {
-            "player_statistics": {name: asdict(stats) for name, stats in self.player_stats.items()},
-            "current_game": asdict(self.current_game_stats) if self.current_game_stats else None,
+            "player_statistics": {name: stats.to_dict() for name, stats in self.player_stats.items()},
+            "current_game": self._current_game_cache,
             "last_updated": datetime.now().isoformat()
         }
     
@@ -392,12 +522,4 @@ class StatisticsManager:
         if "player_statistics" in data:
             for name, stats_dict in data["player_statistics"].items():
                 self.player_stats[name] = PlayerStatistics(**stats_dict)
-    
-    def _merge_statistics_data(self, data: Dict[str, Any]):
-        """合并统计数据"""
-        # 这里可以实现更复杂的合并逻辑
-        # 目前简单地更新不存在的数据
-        if "player_statistics" in data:
-            for name, stats_dict in data["player_statistics"].items():
-                if name not in self.player_stats:
-                    self.player_stats[name] = PlayerStatistics(**stats_dict)
\ No newline at end of file
+                self._dirty.add(name)
\ No newline at end of file
@@ -1,9 +1,21 @@
 import sqlite3
 import os
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 import threading
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+# 默认地图格子的插入语句
+_INSERT_MAP_CELL = '''
+    INSERT INTO game_map (position, name, type, price, rent_base, upgrade_cost, description)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+_DEFAULT_MAP_ROWS = [(0, '起点', 'start', 0, 0, 0, '游戏起始位置')]
+
 class DatabaseManager:
     """数据库管理器 - 单例模式"""
     _instance = None
@@ -19,7 +31,8 @@ class DatabaseManager:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.db_path = 'data/monopoly.db'
-            self.connection = None
+            self._local = threading.local()  # 每个线程持有各自的数据库连接
+            self._config_cache: Dict[str, Optional[str]] = {}  # 配置值缓存，update_config 时失效
             self.initialized = True
             self._ensure_data_directory()
             self._initialize_database()
@@ -43,11 +56,31 @@ class DatabaseManager:
             print(f"连接失败: {e}")
             return False
     
-    def _connect(self):
-        """连接数据库"""
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """当前线程的数据库连接，首次访问时创建"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+        return connection
+    
+    def _connect(self) -> sqlite3.Connection:
+        """为当前线程（重新）连接数据库"""
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
+            old_connection = getattr(self._local, "connection", None)
+            if old_connection is not None:
+                old_connection.close()
+            
+            # 扩大语句缓存，使各查询的预编译语句在整个会话中保持复用
+            connection = sqlite3.connect(self.db_path, cached_statements=256)
+            connection.row_factory = sqlite3.Row
+            # WAL 模式下写入只追加日志，配合 NORMAL 同步级别减少每次提交的 fsync
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA temp_store=MEMORY")
+            connection.execute("PRAGMA cache_size=-20000")
+            self._local.connection = connection
+            return connection
         except sqlite3.Error as e:
             print(f"数据库连接错误: {e}")
             raise
@@ -80,6 +113,18 @@ class DatabaseManager:
             )
         ''')
         
+        # 存档名唯一索引：一次性迁移，旧数据库可能存在同名存档，建索引前只保留最新的一条
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_game_saves_name'"
+        )
+        if cursor.fetchone() is None:
+            cursor.execute('''
+                DELETE FROM game_saves WHERE id NOT IN (
+                    SELECT MAX(id) FROM game_saves GROUP BY save_name
+                )
+            ''')
+            cursor.execute('CREATE UNIQUE INDEX idx_game_saves_name ON game_saves(save_name)')
+        
         # 玩家记录表
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS player_records (
@@ -103,30 +148,24 @@ class DatabaseManager:
         
         self.connection.commit()
     
-    def _load_map_from_json(self) -> List[tuple]:
-        """从JSON配置文件加载地图数据"""
+    def _load_map_from_json(self) -> Iterable[tuple]:
+        """从JSON配置文件加载地图数据，逐个生成插入用的行"""
         try:
             json_path = os.path.join(os.path.dirname(self.db_path), 'default_map.json')
-            with open(json_path, 'r', encoding='utf-8') as f:
-                map_config = json.load(f)
-            
-            map_data = []
-            for cell in map_config['cells']:
-                map_data.append((
-                    cell['position'],
-                    cell['name'],
-                    cell['type'],
-                    cell['price'],
-                    cell['rent'],
-                    cell['upgrade_cost'],
-                    cell['description']
-                ))
-            
-            return map_data
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            with open(json_path, 'rb') as f:
+                raw = f.read()
+            map_config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            cells = map_config['cells']
+        except (FileNotFoundError, ValueError, KeyError) as e:
             print(f"加载地图配置文件失败: {e}")
             # 如果配置文件加载失败，返回基本的起点数据
-            return [(0, '起点', 'start', 0, 0, 0, '游戏起始位置')]
+            return _DEFAULT_MAP_ROWS
+        
+        return (
+            (cell['position'], cell['name'], cell['type'], cell['price'],
+             cell['rent'], cell['upgrade_cost'], cell['description'])
+            for cell in cells
+        )
     
     def _insert_default_data(self):
         """插入默认游戏数据"""
@@ -135,13 +174,14 @@ class DatabaseManager:
         # 检查是否已有地图数据
         cursor.execute('SELECT COUNT(*) FROM game_map')
         if cursor.fetchone()[0] == 0:
-            # 从JSON配置文件加载地图数据
-            map_data = self._load_map_from_json()
-            
-            cursor.executemany('''
-                INSERT INTO game_map (position, name, type, price, rent_base, upgrade_cost, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', map_data)
+            # 从JSON配置文件加载地图数据，在同一个事务中批量插入
+            try:
+                with self.connection:
+                    cursor.executemany(_INSERT_MAP_CELL, self._load_map_from_json())
+            except KeyError as e:
+                print(f"加载地图配置文件失败: 缺少字段 {e}")
+                with self.connection:
+                    cursor.executemany(_INSERT_MAP_CELL, _DEFAULT_MAP_ROWS)
         
         # 插入默认配置
         config_data = [
@@ -152,11 +192,10 @@ class DatabaseManager:
             ('max_players', '6', '最大玩家数'),
         ]
         
-        for key, value, desc in config_data:
-            cursor.execute('''
-                INSERT OR IGNORE INTO game_config (key, value, description)
-                VALUES (?, ?, ?)
-            ''', (key, value, desc))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO game_config (key, value, description)
+            VALUES (?, ?, ?)
+        ''', config_data)
         
         self.connection.commit()
     
@@ -181,24 +220,16 @@ class DatabaseManager:
     def save_game(self, save_name: str, game_data: str) -> bool:
         """保存游戏 - 如果存档已存在则覆盖"""
         try:
-            # 检查是否已存在同名存档
-            existing = self.execute_query(
-                'SELECT id FROM game_saves WHERE save_name = ?',
-                (save_name,)
+            # 同名存档已存在时由唯一索引触发冲突，改为更新现有记录
+            self.execute_update(
+                '''
+                INSERT INTO game_saves (save_name, game_data) VALUES (?, ?)
+                ON CONFLICT(save_name) DO UPDATE SET
+                    game_data = excluded.game_data,
+                    save_date = CURRENT_TIMESTAMP
+                ''',
+                (save_name, game_data)
             )
-            
-            if existing:
-                # 存档已存在，更新现有记录
-                self.execute_update(
-                    'UPDATE game_saves SET game_data = ?, save_date = CURRENT_TIMESTAMP WHERE save_name = ?',
-                    (game_data, save_name)
-                )
-            else:
-                # 存档不存在，插入新记录
-                self.execute_update(
-                    'INSERT INTO game_saves (save_name, game_data) VALUES (?, ?)',
-                    (save_name, game_data)
-                )
             return True
         except sqlite3.Error as e:
             print(f"保存游戏失败: {e}")
@@ -221,8 +252,12 @@ class DatabaseManager:
     
     def get_config(self, key: str) -> Optional[str]:
         """获取配置值"""
+        if key in self._config_cache:
+            return self._config_cache[key]
         rows = self.execute_query('SELECT value FROM game_config WHERE key = ?', (key,))
-        return rows[0]['value'] if rows else None
+        value = rows[0]['value'] if rows else None
+        self._config_cache[key] = value
+        return value
     
     def update_config(self, key: str, value: str) -> bool:
         """更新配置"""
@@ -231,11 +266,28 @@ class DatabaseManager:
                 'UPDATE game_config SET value = ? WHERE key = ?',
                 (value, key)
             )
+            self._config_cache.pop(key, None)
             return True
         except sqlite3.Error as e:
             print(f"更新配置失败: {e}")
             return False
     
+    def set_config(self, key: str, value: str, description: str = "") -> bool:
+        """设置配置，不存在时插入"""
+        try:
+            self.execute_update(
+                '''
+                INSERT INTO game_config (key, value, description) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                ''',
+                (key, value, description)
+            )
+            self._config_cache[key] = value
+            return True
+        except sqlite3.Error as e:
+            print(f"设置配置失败: {e}")
+            return False
+    
     def delete_save(self, save_name: str) -> bool:
         """删除存档"""
         try:
@@ -249,7 +301,8 @@ class DatabaseManager:
             return False
     
     def close(self):
-        """关闭数据库连接"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
\ No newline at end of file
+        """关闭当前线程的数据库连接，其他线程的连接随线程结束释放"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
\ No newline at end of file
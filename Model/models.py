@@ -1,7 +1,7 @@
-from enum import Enum
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum, IntFlag
+from typing import List, Dict, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field, fields, MISSING
+from functools import lru_cache
 import json
 
 class PlayerType(Enum):
@@ -25,8 +25,8 @@ class CellType(Enum):
     HOSPITAL = "hospital"        # 医院
     LUXURY_TAX = "luxury_tax"    # 奢侈税
 
-class PropertyLevel(Enum):
-    """房产等级枚举"""
+class PropertyLevel(IntEnum):
+    """房产等级枚举（整数枚举，可直接参与比较和下标运算）"""
     EMPTY = 0      # 空地
     HOUSE_1 = 1    # 1级房屋
     HOUSE_2 = 2    # 2级房屋
@@ -40,7 +40,30 @@ class GameState(Enum):
     PAUSED = "paused"            # 暂停
     FINISHED = "finished"        # 结束
 
-@dataclass
+class Effect(IntFlag):
+    """玩家特殊效果位标志"""
+    PROPERTY_DISCOUNT = 1        # 购房折扣
+    FREE_MOVE = 2                # 免费移动
+    EXTRA_TURN = 4               # 额外回合
+
+# 枚举取值到成员的缓存查找，用于反序列化（成员数量固定，缓存不会增长）
+_player_type_of = lru_cache(maxsize=None)(PlayerType)
+_cell_type_of = lru_cache(maxsize=None)(CellType)
+_property_level_of = lru_cache(maxsize=None)(PropertyLevel)
+
+# 收取租金的格子类型，以及按房产等级索引的租金倍数
+_RENT_TYPES = frozenset((CellType.PROPERTY, CellType.AIRPORT, CellType.LANDMARK))
+_RENT_MULT = (1, 2, 4, 8, 16)
+
+# 房产等级的下一级，最高级（酒店）没有下一级
+_NEXT_LEVEL = {
+    PropertyLevel.EMPTY: PropertyLevel.HOUSE_1,
+    PropertyLevel.HOUSE_1: PropertyLevel.HOUSE_2,
+    PropertyLevel.HOUSE_2: PropertyLevel.HOUSE_3,
+    PropertyLevel.HOUSE_3: PropertyLevel.HOTEL,
+}
+
+@dataclass(slots=True)
 class Player:
     """玩家类"""
     id: int
@@ -49,18 +72,24 @@ class Player:
     money: int = 15000
     position: int = 0
     avatar: str = "default"
-    is_in_jail: bool = False
-    jail_turns: int = 0
+    jail_turns: int = 0  # 剩余服刑回合数，0 表示不在监狱
     is_bankrupt: bool = False
-    properties: List[int] = field(default_factory=list)
+    properties: Set[int] = field(default_factory=set)
     items: List[str] = field(default_factory=list)
     
-    def move(self, steps: int, board_size: int = 36):
-        """移动玩家"""
-        old_position = self.position
-        self.position = (self.position + steps) % board_size
-        # 检查是否经过起点
-        return self.position < old_position or (old_position + steps >= board_size)
+    def move(self, steps: int, board_size: int = 36, bonus: int = 0) -> Tuple[int, int]:
+        """向前移动 steps（非负）步，经过起点时获得 bonus 奖励，返回(新位置, 实际获得的奖励)"""
+        new_position = self.position + steps
+        # 超出棋盘即经过起点，用减法代替取模完成回绕
+        if new_position >= board_size:
+            new_position -= board_size
+            if new_position >= board_size:  # 步数超过一整圈
+                new_position %= board_size
+            self.position = new_position
+            self.money += bonus
+            return new_position, bonus
+        self.position = new_position
+        return new_position, 0
     
     def add_money(self, amount: int):
         """增加金钱"""
@@ -76,38 +105,45 @@ class Player:
     def buy_property(self, property_id: int, price: int) -> bool:
         """购买房产"""
         if self.spend_money(price):
-            self.properties.append(property_id)
+            self.properties.add(property_id)
             return True
         return False
     
     def sell_property(self, property_id: int, price: int):
         """出售房产"""
-        if property_id in self.properties:
+        # properties 为集合，remove 一次哈希查找即可同时完成判断和删除
+        try:
             self.properties.remove(property_id)
-            self.add_money(price)
+        except KeyError:
+            return
+        self.add_money(price)
+    
+    @property
+    def is_in_jail(self) -> bool:
+        """是否在监狱中"""
+        return self.jail_turns > 0
     
     def go_to_jail(self):
         """进监狱"""
-        self.is_in_jail = True
         self.jail_turns = 3
         self.position = 9  # 监狱位置（玩家位置从0开始，监狱是地图位置10，对应玩家位置9）
     
     def try_leave_jail(self, pay_fine: bool = False) -> bool:
         """尝试出狱"""
-        if not self.is_in_jail:
+        turns = self.jail_turns
+        if turns <= 0:
             return True
         
-        if pay_fine and self.spend_money(500):
-            self.is_in_jail = False
+        # 交罚金出狱（余额检查与扣款直接内联）
+        if pay_fine and self.money >= 500:
+            self.money -= 500
             self.jail_turns = 0
             return True
         
-        self.jail_turns -= 1
-        if self.jail_turns <= 0:
-            self.is_in_jail = False
-            return True
-        
-        return False
+        # 服刑一回合，期满即出狱
+        turns -= 1
+        self.jail_turns = turns
+        return turns == 0
     
     def check_bankruptcy(self) -> bool:
         """检查是否破产"""
@@ -124,31 +160,14 @@ class Player:
             'money': self.money,
             'position': self.position,
             'avatar': self.avatar,
-            'is_in_jail': self.is_in_jail,
+            'is_in_jail': self.jail_turns > 0,  # 保留该字段以兼容旧存档格式
             'jail_turns': self.jail_turns,
             'is_bankrupt': self.is_bankrupt,
-            'properties': self.properties,
+            'properties': sorted(self.properties),
             'items': self.items
         }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Player':
-        """从字典创建玩家"""
-        return cls(
-            id=data['id'],
-            name=data['name'],
-            player_type=PlayerType(data['player_type']),
-            money=data['money'],
-            position=data['position'],
-            avatar=data['avatar'],
-            is_in_jail=data['is_in_jail'],
-            jail_turns=data['jail_turns'],
-            is_bankrupt=data['is_bankrupt'],
-            properties=data['properties'],
-            items=data['items']
-        )
 
-@dataclass
+@dataclass(slots=True)
 class MapCell:
     """地图格子类"""
     id: int
@@ -161,31 +180,31 @@ class MapCell:
     description: str = ""
     owner_id: Optional[int] = None
     level: PropertyLevel = PropertyLevel.EMPTY
+    tax_fixed: int = field(default=0, init=False, repr=False, compare=False)  # 固定税额，0表示按税率计算
+    _rent_table: Tuple[int, ...] = field(default=(), init=False, repr=False, compare=False)  # 按等级索引的租金
+    
+    def __post_init__(self):
+        # 格子名称不会改变，构造时确定税额类型，避免每次交税都扫描名称
+        if "所得税" in self.name:
+            self.tax_fixed = 200
+        elif "奢侈税" in self.name:
+            self.tax_fixed = 100
+        # 格子类型和基础租金不会改变，构造时算好各等级租金；
+        # 等级可能被命令直接赋值，按等级查表即可，无需失效处理
+        if self.cell_type in _RENT_TYPES:
+            self._rent_table = tuple(self.rent_base * mult for mult in _RENT_MULT)
+        else:
+            self._rent_table = (0,) * len(_RENT_MULT)
     
     def get_rent(self) -> int:
         """获取租金"""
-        if self.cell_type not in [CellType.PROPERTY, CellType.AIRPORT, CellType.LANDMARK]:
-            return 0
-        
-        base_rent = self.rent_base
-        if self.level == PropertyLevel.EMPTY:
-            return base_rent
-        elif self.level == PropertyLevel.HOUSE_1:
-            return base_rent * 2
-        elif self.level == PropertyLevel.HOUSE_2:
-            return base_rent * 4
-        elif self.level == PropertyLevel.HOUSE_3:
-            return base_rent * 8
-        elif self.level == PropertyLevel.HOTEL:
-            return base_rent * 16
-        
-        return base_rent
+        return self._rent_table[self.level]
     
     def can_upgrade(self) -> bool:
         """是否可以升级"""
         return (self.cell_type == CellType.PROPERTY and 
                 self.owner_id is not None and 
-                self.level.value < PropertyLevel.HOTEL.value)
+                self.level < PropertyLevel.HOTEL)
     
     def get_upgrade_cost(self) -> int:
         """获取升级费用"""
@@ -193,8 +212,10 @@ class MapCell:
     
     def upgrade(self) -> int:
         """升级房产，返回升级费用"""
-        if self.can_upgrade():
-            self.level = PropertyLevel(self.level.value + 1)
+        next_level = _NEXT_LEVEL.get(self.level)
+        if (next_level is not None and self.owner_id is not None and
+                self.cell_type == CellType.PROPERTY):
+            self.level = next_level
             return self.upgrade_cost
         return 0
     
@@ -217,24 +238,53 @@ class MapCell:
             'owner_id': self.owner_id,
             'level': self.level.value
         }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'MapCell':
-        """从字典创建地图格子"""
-        return cls(
-            id=data['id'],
-            position=data['position'],
-            name=data['name'],
-            cell_type=CellType(data['cell_type']),
-            price=data['price'],
-            rent_base=data['rent_base'],
-            upgrade_cost=data['upgrade_cost'],
-            description=data['description'],
-            owner_id=data['owner_id'],
-            level=PropertyLevel(data['level'])
-        )
 
-@dataclass
+# 反序列化使用模块级函数：绕过 __init__ 的参数绑定和默认值处理，直接写入各个槽位
+def player_from_dict(data: Dict[str, Any]) -> Player:
+    """从字典创建玩家"""
+    player = Player.__new__(Player)
+    player.id = data['id']
+    player.name = data['name']
+    player.player_type = _player_type_of(data['player_type'])
+    player.money = data['money']
+    player.position = data['position']
+    player.avatar = data['avatar']
+    # 旧存档中在狱但剩余回合不为正时，下次尝试即出狱，对应剩余 1 回合
+    player.jail_turns = max(data['jail_turns'], 1) if data['is_in_jail'] else 0
+    player.is_bankrupt = data['is_bankrupt']
+    player.properties = set(data['properties'])
+    player.items = data['items']
+    return player
+
+def map_cell_from_dict(data: Dict[str, Any]) -> MapCell:
+    """从字典创建地图格子"""
+    cell = MapCell.__new__(MapCell)
+    cell.id = data['id']
+    cell.position = data['position']
+    cell.name = data['name']
+    cell.cell_type = _cell_type_of(data['cell_type'])
+    cell.price = data['price']
+    cell.rent_base = data['rent_base']
+    cell.upgrade_cost = data['upgrade_cost']
+    cell.description = data['description']
+    cell.owner_id = data['owner_id']
+    cell.level = _property_level_of(data['level'])
+    cell.tax_fixed = 0
+    cell.__post_init__()
+    return cell
+
+# 保留原有的类方法调用方式
+Player.from_dict = staticmethod(player_from_dict)
+MapCell.from_dict = staticmethod(map_cell_from_dict)
+
+def build_type_index(cells: List[MapCell]) -> Dict[CellType, Tuple[MapCell, ...]]:
+    """按格子类型分组地图格子，地图加载后构建一次，按类型遍历时无需扫描整个棋盘"""
+    index: Dict[CellType, List[MapCell]] = {}
+    for cell in cells:
+        index.setdefault(cell.cell_type, []).append(cell)
+    return {cell_type: tuple(group) for cell_type, group in index.items()}
+
+@dataclass(slots=True)
 class GameEvent:
     """游戏事件类"""
     event_type: str
@@ -259,9 +309,9 @@ class GameEvent:
             effect=data['effect']
         )
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GameConfig:
-    """游戏配置类"""
+    """游戏配置类（不可变，修改配置请使用 dataclasses.replace 生成新实例）"""
     initial_money: int = 15000
     start_bonus: int = 200
     jail_fine: int = 500
@@ -291,70 +341,49 @@ class GameConfig:
     sound_enabled: bool = True
     difficulty_level: str = "medium"
     language: str = "zh_CN"
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'initial_money': self.initial_money,
-            'start_bonus': self.start_bonus,
-            'jail_fine': self.jail_fine,
-            'tax_rate': self.tax_rate,
-            'max_players': self.max_players,
-            'board_size': self.board_size,
-            'jail_position': self.jail_position,
-            'hospital_position': self.hospital_position,
-            'tax_office_position': self.tax_office_position,
-            'jail_turns': self.jail_turns,
-            'hospital_fee': self.hospital_fee,
-            'min_players': self.min_players,
-            'dice_count': self.dice_count,
-            'dice_sides': self.dice_sides,
-            'auto_save_interval': self.auto_save_interval,
-            'max_save_slots': self.max_save_slots,
-            'enable_sound': self.enable_sound,
-            'animation_enabled': self.animation_enabled,
-            'game_speed': self.game_speed,
-            'bankruptcy_threshold': self.bankruptcy_threshold,
-            'property_mortgage_rate': self.property_mortgage_rate,
-            'hotel_limit': self.hotel_limit,
-            'house_limit': self.house_limit,
-            'auction_enabled': self.auction_enabled,
-            'trading_enabled': self.trading_enabled,
-            'time_limit_per_turn': self.time_limit_per_turn,
-            'sound_enabled': self.sound_enabled,
-            'difficulty_level': self.difficulty_level,
-            'language': self.language
-        }
+        """转换为字典（配置不可变，首次生成后缓存，每次返回缓存的浅拷贝，调用方可自由修改）"""
+        d = self._dict_cache
+        if d is None:
+            d = _build_config_dict(self)
+            object.__setattr__(self, '_dict_cache', d)
+        return dict(d)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GameConfig':
-        return cls(
-            initial_money=data.get('initial_money', 15000),
-            start_bonus=data.get('start_bonus', 200),
-            jail_fine=data.get('jail_fine', 500),
-            tax_rate=data.get('tax_rate', 0.1),
-            max_players=data.get('max_players', 6),
-            board_size=data.get('board_size', 37),
-            jail_position=data.get('jail_position', 10),
-            hospital_position=data.get('hospital_position', 20),
-            tax_office_position=data.get('tax_office_position', 30),
-            jail_turns=data.get('jail_turns', 3),
-            hospital_fee=data.get('hospital_fee', 1000),
-            min_players=data.get('min_players', 2),
-            dice_count=data.get('dice_count', 2),
-            dice_sides=data.get('dice_sides', 6),
-            auto_save_interval=data.get('auto_save_interval', 300),
-            max_save_slots=data.get('max_save_slots', 10),
-            enable_sound=data.get('enable_sound', True),
-            animation_enabled=data.get('animation_enabled', True),
-            game_speed=data.get('game_speed', 1.0),
-            bankruptcy_threshold=data.get('bankruptcy_threshold', 0),
-            property_mortgage_rate=data.get('property_mortgage_rate', 0.5),
-            hotel_limit=data.get('hotel_limit', 4),
-            house_limit=data.get('house_limit', 32),
-            auction_enabled=data.get('auction_enabled', True),
-            trading_enabled=data.get('trading_enabled', True),
-            time_limit_per_turn=data.get('time_limit_per_turn', 300),
-            sound_enabled=data.get('sound_enabled', True),
-            difficulty_level=data.get('difficulty_level', 'medium'),
-            language=data.get('language', 'zh_CN')
-        )
\ No newline at end of file
+        """从字典创建配置，缺失的配置项使用默认值"""
+        return cls(**{key: data.get(key, default) for key, default in _CFG_DEFAULTS.items()})
+
+def generate_dict_builder(cls):
+    """按数据类的 init 字段生成 to_dict 函数，省去 asdict 的逐字段反射和递归深拷贝
+    
+    集合字段输出为排序后的列表，列表字段输出为副本；字段增减时无需同步维护字典字面量
+    """
+    items = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        origin = getattr(f.type, "__origin__", None)
+        if origin is set:
+            expr = f"sorted(self.{f.name})"
+        elif origin is list:
+            expr = f"list(self.{f.name})"
+        else:
+            expr = f"self.{f.name}"
+        items.append(f"{f.name!r}: {expr}")
+    
+    source = "def to_dict(self):\n    return {" + ", ".join(items) + "}\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    return to_dict
+
+_build_config_dict = generate_dict_builder(GameConfig)
+
+# 配置项默认值表，由 GameConfig 的字段定义生成
+_CFG_DEFAULTS: Dict[str, Any] = {
+    f.name: f.default for f in fields(GameConfig) if f.init and f.default is not MISSING
+}
\ No newline at end of file
@@ -1,15 +1,107 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import tkinter.font as tkfont
 import threading
+from queue import SimpleQueue, Empty
 import time
 from typing import List, Dict, Any, Optional
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw
 import math
+from dataclasses import replace
+from contextlib import contextmanager
+from collections import deque
+from functools import lru_cache
 
 from BLL.game_manager import GameManager
 from Model.models import Player, PlayerType, GameState, CellType
 from BLL.events import EventObserver
 
+# 格子配色方案 - 豪华大富翁配色
+_CELL_COLORS = {
+    CellType.START: '#FFD700',      # 金色 - 起点
+    CellType.PROPERTY: '#4169E1',   # 皇家蓝 - 房产
+    CellType.AIRPORT: '#FF4500',    # 橙红色 - 机场
+    CellType.UTILITY: '#C0C0C0',    # 银色 - 公用事业
+    CellType.LANDMARK: '#8A2BE2',   # 蓝紫色 - 地标
+    CellType.CHANCE: '#FF69B4',     # 热粉色 - 机会
+    CellType.MISFORTUNE: '#FF8C00', # 深橙色 - 命运
+    CellType.TAX: '#B22222',        # 火砖红 - 税务
+    CellType.JAIL: '#708090',       # 石板灰 - 监狱
+    CellType.GO_TO_JAIL: '#2F4F4F', # 暗石板灰 - 进监狱
+    CellType.FREE_PARKING: '#FFD700' # 金色 - 免费停车
+}
+
+
+def _compute_highlight(base_color: str) -> str:
+    """计算高光颜色 - 用于渐变效果"""
+    # 将十六进制颜色转换为RGB，然后增加亮度
+    hex_color = base_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    
+    # 增加亮度（最大255）
+    highlight_rgb = tuple(min(255, int(c * 1.3)) for c in rgb)
+    
+    # 转换回十六进制
+    return '#{:02x}{:02x}{:02x}'.format(*highlight_rgb)
+
+
+def _hex_to_rgb(color: str) -> tuple:
+    """把 #RRGGBB 颜色解析为 (r, g, b)，不是十六进制颜色（如 'red'）时抛出 ValueError"""
+    hex_color = color.lstrip('#')[:6]
+    if len(hex_color) != 6:
+        raise ValueError(color)
+    value = int(hex_color, 16)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+# 各格子颜色对应的高光颜色，导入时一次算好
+_HIGHLIGHTS = {color: _compute_highlight(color) for color in set(_CELL_COLORS.values())}
+
+# 预渲染格子图形在格子四周留出的边距（容纳向外扩展的边框）
+_CHROME_PAD = 2
+
+# 玩家图标移动动画：每经过一个格子的帧数，逐格移动的最大步数（超过时直线移动）
+_TOKEN_FRAMES_PER_CELL = 6
+_TOKEN_WALK_MAX_STEPS = 12
+
+@lru_cache(maxsize=None)
+def _wrap_cell_name(name: str) -> tuple:
+    """把格子名称按每行4个字切分，最多保留2行"""
+    return tuple(name[i:i+4] for i in range(0, min(len(name), 8), 4))
+
+# 可以拥有（显示所有权覆盖层）的格子类型
+_OWNABLE_TYPES = frozenset((CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY, CellType.LANDMARK))
+
+# 观察者事件队列的检查间隔（毫秒）和每次最多处理的事件数
+_EVENT_POLL_MS = 16
+_EVENT_DRAIN_LIMIT = 100
+
+# 监狱中玩家图标上栅栏相对图标中心的横向偏移
+_JAIL_BAR_DX = (-8, -4, 0, 4, 8)
+
+# 日志最多保留的条数，超出后丢弃最早的日志
+_LOG_LIMIT = 2000
+
+# 日志过滤选项 -> 包含的日志类型，None 表示全部
+_LOG_FILTERS = {
+    "全部": None,
+    "重要": ('warning', 'error', 'success'),
+    "交易": ('trade',),
+    "移动": ('move',),
+    "系统": ('system',)
+}
+
+# 日志类型对应的图标
+_LOG_ICONS = {
+    'info': '💬 ',
+    'warning': '⚠️ ',
+    'error': '❌ ',
+    'success': '✅ ',
+    'trade': '💰 ',
+    'move': '🚶 ',
+    'system': '⚙️ '
+}
+
 class GameGUI(EventObserver):
     """游戏主界面"""
     
@@ -26,6 +118,8 @@ class GameGUI(EventObserver):
         
         # 游戏管理器
         self.game_manager = GameManager()
+        # 观察者事件队列：回调可能来自任意线程，只入队，由 Tk 主线程定时取出处理
+        self._event_queue = SimpleQueue()
         self.game_manager.attach(self)  # 注册为观察者
         
         # 界面变量
@@ -33,6 +127,35 @@ class GameGUI(EventObserver):
         self.cell_size = 72     # 适当减小格子大小以优化布局
         self.player_colors = ['red', 'blue', 'green', 'yellow', 'purple', 'orange']
         self.player_positions = {}  # 玩家在界面上的位置
+        self._player_color_by_id = {}  # 玩家ID -> 颜色，玩家名单或顺序变化时重建
+        self._color_roster = ()        # 建立颜色映射时的玩家名单（ID和名称）
+        self._owner_info = {}          # 玩家ID -> 所有者显示信息
+        self._player_tokens = {}       # 玩家ID -> 图标信息（画布标签、当前坐标、显示状态）
+        self._token_roster = ()        # 创建图标时的玩家名单
+        self._player_rows = {}         # 玩家列表行ID -> 上次显示的（名称, 数值）
+        self._player_row_order = ()    # 玩家列表当前的行顺序
+        self._widget_options = {}      # 控件 -> 上次通过 _config_if_changed 设置的选项
+        
+        # 棋盘布局固定，预先计算每个位置的格子坐标（标准布局最多40个位置）
+        border_offset = 20
+        self._cell_xy = self._build_position_table(10, self.canvas_size - border_offset * 2)
+        
+        # 棋盘静态部分只在地图变化时重建，所有权/等级等动态部分按格子增量更新
+        self._board_cells = None   # 当前已绘制的地图格子列表
+        self._cell_items = {}      # 格子索引 -> 所有权/等级覆盖层的画布项
+        self._cell_state = {}      # 格子索引 -> 上次绘制时的所有权状态
+        self._bg_image = None      # 渐变背景图像
+        self._chrome_cache = {}    # (格子类型, 是否显示价格) -> 预渲染的格子静态图形
+        self._board_photo = None   # 背景、边框和格子静态图形合成的整张棋盘图像
+        self._board_layout = None  # 生成棋盘图像时每个格子的（类型, 是否显示价格）
+        self._font_cache = {}      # (字体, 字号, 粗细) -> 字体对象
+        self._center_items = {}    # 中央信息中会变化的画布项
+        self._center_state = None  # 中央信息上次显示的内容
+        
+        # 刷新请求合并：同一轮空闲处理内的多次请求只刷新一次
+        self._dirty = set()             # 等待刷新的界面部分
+        self._flush_scheduled = False   # 是否已安排空闲回调
+        self._batch_depth = 0           # batch_updates 嵌套层数
         
         # 创建界面
         self._create_widgets()
@@ -44,6 +167,7 @@ class GameGUI(EventObserver):
         
         # 绑定事件
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+        self.root.after(_EVENT_POLL_MS, self._drain_events)
     
     def _create_menu(self):
         """创建菜单栏"""
@@ -100,7 +224,7 @@ class GameGUI(EventObserver):
         self._create_log_panel(right_frame)
         
         # 初始化游戏板
-        self._draw_board()
+        self._mark_dirty('board')
     
     def _create_control_panel(self, parent):
         """创建控制按钮面板"""
@@ -271,7 +395,8 @@ class GameGUI(EventObserver):
         text_frame = ttk.Frame(log_frame)
         text_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.log_text = tk.Text(text_frame, height=12, state=tk.DISABLED, wrap=tk.WORD,
+        # 不自动换行：避免每次插入都重新计算换行布局，长日志用水平滚动条查看
+        self.log_text = tk.Text(text_frame, height=12, state=tk.DISABLED, wrap=tk.NONE,
                                font=('Consolas', 9), bg='#f8f9fa', fg='#333333',
                                selectbackground='#007acc', selectforeground='white')
         
@@ -300,132 +425,117 @@ class GameGUI(EventObserver):
         self.log_text.tag_configure('move', foreground='#17a2b8')
         self.log_text.tag_configure('timestamp', foreground='#6c757d', font=('Consolas', 8))
         
-        # 存储所有日志用于过滤
-        self.all_logs = []
+        # 存储所有日志用于过滤，每个过滤选项另存一份对应的日志，切换过滤时无需重新筛选
+        self.all_logs = deque(maxlen=_LOG_LIMIT)
+        self._filtered_logs = {name: deque(maxlen=_LOG_LIMIT) for name, types in _LOG_FILTERS.items() if types}
+        self._log_filter = "全部"        # 当前过滤选项
+        self._shown_log_lines = deque()  # 文本框中每条日志所占的行数，用于删除最早的日志
+        self._log_buffer = []            # 等待插入文本框的日志
+        self._log_flush_scheduled = False
     
     def _draw_board(self):
-        """绘制游戏板"""
+        """绘制游戏板：地图变化时重建静态部分，其余情况只刷新发生变化的内容"""
+        if self._board_cells is not self.game_manager.map_cells:
+            self._build_board()
+        self._refresh_board()
+    
+    def _mark_dirty(self, *kinds: str):
+        """标记需要刷新的界面部分（'board' 棋盘、'players' 玩家列表、'info' 游戏信息），
+        实际刷新推迟到 Tk 空闲时进行，同一轮内的多次标记合并为一次"""
+        self._dirty.update(kinds)
+        if self._batch_depth == 0 and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_ui)
+    
+    def _flush_ui(self):
+        """执行挂起的刷新，每个部分只刷新一次"""
+        self._flush_scheduled = False
+        if not self._dirty or self._batch_depth:
+            return
+        dirty, self._dirty = self._dirty, set()
+        if 'players' in dirty:
+            self._update_player_list()
+        if 'info' in dirty:
+            self._update_game_info()
+        if 'board' in dirty:
+            self._draw_board()
+    
+    @contextmanager
+    def batch_updates(self):
+        """在 with 块内暂缓刷新，退出最外层时统一刷新一次；可嵌套使用"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._mark_dirty()
+    
+    def _build_board(self):
+        """绘制游戏板中不随游戏进程变化的部分（背景、边框、格子、名称、价格）"""
         self.canvas.delete("all")
+        self._board_cells = self.game_manager.map_cells
+        self._cell_items = {}
+        self._cell_state = {}
+        self._player_tokens = {}
+        self._token_roster = ()
         
-        # 绘制豪华渐变背景
-        self._draw_gradient_background()
-        
-        # 绘制装饰性边框
-        border_width = 8
-        self.canvas.create_rectangle(border_width//2, border_width//2, 
-                                   self.canvas_size - border_width//2, 
-                                   self.canvas_size - border_width//2,
-                                   fill='', outline='#8B4513', width=border_width)
-        
-        # 绘制内部装饰边框
-        inner_border = border_width + 4
-        self.canvas.create_rectangle(inner_border, inner_border, 
-                                   self.canvas_size - inner_border, 
-                                   self.canvas_size - inner_border,
-                                   fill='', outline='#FFD700', width=2)
-        
-        # 绘制地图格子
+        # 背景、边框和所有格子的静态图形合成为一张图像，只放置一个图像项
         cells = self.game_manager.map_cells
+        layout = tuple((cell.cell_type, cell.price > 0 and cell.cell_type in [CellType.PROPERTY, CellType.AIRPORT, CellType.LANDMARK])
+                       for cell in cells)
+        if layout != self._board_layout:
+            self._board_photo = ImageTk.PhotoImage(self._render_board_image(layout))  # 保持引用，防止图像被回收
+            self._board_layout = layout
+        board = self.canvas.create_image(0, 0, anchor=tk.NW, image=self._board_photo, tags="static")
+        # 绑定点击事件，按点击坐标确定格子
+        self.canvas.tag_bind(board, "<Button-1>", self._on_board_click)
+        
+        # 绘制地图格子上的文字
         if not cells:
             return
 
-        total_cells = len(cells)
-        # 统一边距计算：边框(8) + 内边框间距(4) + 额外间距(8) = 20px 每边
-        border_offset = 20
-        board_size = self.canvas_size - (border_offset * 2)
-        
-        # 计算每边的格子数（不包括角落格子重复计算）
-        # 40个格子的标准布局：每边10个格子，角落格子不重复计算
-        cells_per_side = 10
-        
+        # 格子坐标在初始化时已按标准布局（每边10个格子）计算好
+        cell_xy = self._cell_xy
         for i, cell in enumerate(cells):
-            x, y = self._get_cell_position(i, cells_per_side, board_size)
-            
-            # 绘制格子 - 豪华大富翁样式
-            color = self._get_cell_color(cell.cell_type)
-            
-            # 绘制深层阴影效果
-            shadow_offset = 3
-            self.canvas.create_rectangle(x + shadow_offset, y + shadow_offset, 
-                                       x + self.cell_size + shadow_offset, 
-                                       y + self.cell_size + shadow_offset,
-                                       fill='#404040', outline='', width=0)
-            
-            # 绘制主格子 - 加强边框
-            rect = self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size,
-                                              fill=color, outline='#1C1C1C', width=3)
-            
-            # 绘制渐变效果 - 顶部高光
-            highlight_color = self._get_highlight_color(color)
-            self.canvas.create_rectangle(x + 2, y + 2, x + self.cell_size - 2, y + 8,
-                                       fill=highlight_color, outline='', width=0)
-            
-            # 绘制内边框装饰 - 金色边框
-            self.canvas.create_rectangle(x + 4, y + 4, x + self.cell_size - 4, y + self.cell_size - 4,
-                                       fill='', outline='#FFD700', width=1)
-            
-            # 绘制角落装饰
-            corner_size = 6
-            self.canvas.create_rectangle(x + 2, y + 2, x + corner_size, y + corner_size,
-                                       fill='#FFD700', outline='#B8860B', width=1)
-            self.canvas.create_rectangle(x + self.cell_size - corner_size, y + 2, 
-                                       x + self.cell_size - 2, y + corner_size,
-                                       fill='#FFD700', outline='#B8860B', width=1)
+            x, y = cell_xy[i]
+            has_price = layout[i][1]
             
-            # 特殊格子的额外装饰
+            # 特殊格子的文字装饰
             if cell.cell_type == CellType.START:
-                # 绘制大型起点标识背景
-                self.canvas.create_rectangle(x+2, y+2, x+self.cell_size-2, y+25,
-                                           fill='#FF4500', outline='#8B0000', width=2)
                 # 绘制"起点"大字
                 self.canvas.create_text(x+self.cell_size//2, y+13, text="起点", 
-                                       font=('微软雅黑', 14, 'bold'), fill='#FFFFFF')
+                                       font=self._font('微软雅黑', 14, 'bold'), fill='#FFFFFF', tags="static")
                 
                 # 绘制GO箭头
                 self.canvas.create_text(x+35, y+40, text="GO", 
-                                       font=('Arial', 12, 'bold'), fill='#000000')
+                                       font=self._font('Arial', 12, 'bold'), fill='#000000', tags="static")
                 
-                # 绘制钱币图标
-                self.canvas.create_oval(x+50, y+32, x+65, y+47, 
-                                       fill='#FFD700', outline='#000000', width=2)
+                # 钱币图标上的符号
                 self.canvas.create_text(x+57, y+39, text="$", 
-                                       font=('Arial', 10, 'bold'), fill='#000000')
+                                       font=self._font('Arial', 10, 'bold'), fill='#000000', tags="static")
                 
                 # 绘制奖励金额
                 self.canvas.create_text(x+self.cell_size//2, y+60, text="领取200元", 
-                                       font=('微软雅黑', 8), fill='#000000')
+                                       font=self._font('微软雅黑', 8), fill='#000000', tags="static")
             elif cell.cell_type == CellType.CHANCE:
                 # 绘制机会卡片样式
-                self.canvas.create_rectangle(x+5, y+5, x+15, y+15,
-                                           fill='#FFFFFF', outline='#000000', width=2)
                 self.canvas.create_text(x+10, y+10, text="?", 
-                                       font=('Arial', 8, 'bold'), fill='#FF6B35')
+                                       font=self._font('Arial', 8, 'bold'), fill='#FF6B35', tags="static")
                 self.canvas.create_text(x+25, y+10, text="机会", 
-                                       font=('微软雅黑', 8), fill='#FFFFFF')
+                                       font=self._font('微软雅黑', 8), fill='#FFFFFF', tags="static")
             elif cell.cell_type == CellType.MISFORTUNE:
                 # 绘制命运卡片样式
-                self.canvas.create_rectangle(x+5, y+5, x+15, y+15,
-                                           fill='#FFFFFF', outline='#000000', width=2)
                 self.canvas.create_text(x+10, y+10, text="!", 
-                                       font=('Arial', 8, 'bold'), fill='#FF0000')
+                                       font=self._font('Arial', 8, 'bold'), fill='#FF0000', tags="static")
                 self.canvas.create_text(x+25, y+10, text="命运", 
-                                       font=('微软雅黑', 8), fill='#FFFFFF')
+                                       font=self._font('微软雅黑', 8), fill='#FFFFFF', tags="static")
             elif cell.cell_type == CellType.JAIL:
-                # 绘制监狱图标
-                self.canvas.create_rectangle(x+5, y+5, x+15, y+15,
-                                           fill='#696969', outline='#000000', width=2)
-                # 绘制栅栏
-                for bar_x in range(x+7, x+19, 3):
-                    self.canvas.create_line(bar_x, y+7, bar_x, y+18, 
-                                          fill='#000000', width=1)
                 self.canvas.create_text(x+30, y+12, text="监狱", 
-                                       font=('微软雅黑', 8), fill='#000000')
+                                       font=self._font('微软雅黑', 8), fill='#000000', tags="static")
             elif cell.cell_type == CellType.TAX:
-                # 绘制税收图标
-                self.canvas.create_polygon(x+5, y+15, x+10, y+5, x+15, y+15,
-                                         fill='#FF0000', outline='#000000', width=2)
                 self.canvas.create_text(x+25, y+10, text="税收", 
-                                       font=('微软雅黑', 8), fill='#000000')
+                                       font=self._font('微软雅黑', 8), fill='#000000', tags="static")
             
             # 绘制格子名称 - 改进的文字布局
             text_x = x + self.cell_size // 2
@@ -434,86 +544,217 @@ class GameGUI(EventObserver):
             # 根据格子类型调整文字颜色
             text_color = '#000000' if cell.cell_type not in [CellType.JAIL, CellType.GO_TO_JAIL] else '#FFFFFF'
             
-            # 分行显示长文本
-            name = cell.name
-            if len(name) > 4:
-                lines = [name[i:i+4] for i in range(0, len(name), 4)]
-                for j, line in enumerate(lines[:2]):  # 最多显示2行
+            # 分行显示长文本（最多显示2行，每行4个字）
+            if len(cell.name) > 4:
+                for j, line in enumerate(_wrap_cell_name(cell.name)):
                     self.canvas.create_text(text_x, text_y - 10 + j * 12, 
-                                          text=line, font=('微软雅黑', 9, 'bold'), 
-                                          anchor=tk.CENTER, fill=text_color)
+                                          text=line, font=self._font('微软雅黑', 9, 'bold'), 
+                                          anchor=tk.CENTER, fill=text_color, tags="static")
             else:
-                self.canvas.create_text(text_x, text_y, text=name, 
-                                      font=('微软雅黑', 10, 'bold'), 
-                                      anchor=tk.CENTER, fill=text_color)
+                self.canvas.create_text(text_x, text_y, text=cell.name, 
+                                      font=self._font('微软雅黑', 10, 'bold'), 
+                                      anchor=tk.CENTER, fill=text_color, tags="static")
             
-            # 显示房产所有权和等级 - 改进的视觉效果
-            if cell.owner_id is not None and cell.cell_type in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY, CellType.LANDMARK]:
-                # 获取玩家颜色
-                owner = self.game_manager.get_player_by_id(cell.owner_id)
-                if owner:
-                    player_index = self.game_manager.players.index(owner)
-                    owner_color = self.player_colors[player_index % len(self.player_colors)]
-                    
-                    # 绘制玩家颜色边框表示所有权
-                    self.canvas.create_rectangle(x + 1, y + 1, x + self.cell_size - 1, y + self.cell_size - 1,
-                                                fill='', outline=owner_color, width=4)
-                    
-                    # 在左上角绘制玩家颜色标识
-                    self.canvas.create_rectangle(x + 3, y + 3, x + 20, y + 20,
-                                                fill=owner_color, outline='#000000', width=2)
-                    
-                    # 在颜色标识中显示玩家名称首字母
-                    initial = owner.name[0] if owner.name else '?'
-                    self.canvas.create_text(x + 11, y + 11, text=initial,
-                                          font=('Arial', 10, 'bold'), anchor=tk.CENTER, fill='white')
-                    
-                    # 显示房产等级（仅限房产类型）- 根据购买者区分样式
-                    if cell.cell_type == CellType.PROPERTY and hasattr(cell, 'level'):
-                        level_text = "★" * cell.level.value if cell.level.value > 0 else "○"
-                        
-                        # 根据玩家颜色定制房屋等级样式
-                        level_bg_color = owner_color
-                        level_border_color = self._get_darker_color(owner_color)
-                        level_text_color = '#FFFFFF' if self._is_dark_color(owner_color) else '#000000'
-                        
-                        # 现代化圆角矩形背景
-                        self.canvas.create_rectangle(x + self.cell_size - 22, y + 2, x + self.cell_size - 2, y + 18,
-                                                    fill=level_bg_color, outline=level_border_color, width=2)
-                        # 添加内部高光效果
-                        self.canvas.create_rectangle(x + self.cell_size - 20, y + 4, x + self.cell_size - 4, y + 8,
-                                                    fill=self._get_lighter_color(owner_color), outline='', width=0)
-                        
-                        self.canvas.create_text(x + self.cell_size - 12, y + 10, text=level_text,
-                                              font=('Arial', 8, 'bold'), anchor=tk.CENTER, fill=level_text_color)
-            
-            # 显示价格信息（仅房产类格子）- 增强可见性
-            if cell.price > 0 and cell.cell_type in [CellType.PROPERTY, CellType.AIRPORT, CellType.LANDMARK]:
-                price_text = f'${cell.price}'
-                # 添加价格背景框
-                price_bg_x1 = x + 5
-                price_bg_y1 = y + self.cell_size - 18
-                price_bg_x2 = x + self.cell_size - 5
-                price_bg_y2 = y + self.cell_size - 4
-                self.canvas.create_rectangle(price_bg_x1, price_bg_y1, price_bg_x2, price_bg_y2,
-                                           fill='#FFFF99', outline='#FFD700', width=1)
-                # 显示价格文字
+            # 显示价格信息（仅房产类格子，价格背景框已包含在格子图像中）
+            if has_price:
                 self.canvas.create_text(x + self.cell_size // 2, y + self.cell_size - 11, 
-                                      text=price_text, font=('Arial', 9, 'bold'), 
-                                      anchor=tk.CENTER, fill='#8B4513')
-            
-            # 绑定点击事件
-            self.canvas.tag_bind(rect, "<Button-1>", 
-                               lambda e, pos=i: self._on_cell_click(pos))
+                                      text=f'${cell.price}', font=self._font('Arial', 9, 'bold'), 
+                                      anchor=tk.CENTER, fill='#8B4513', tags="static")
+        
+        # 中央区域的游戏信息
+        self._create_center_info()
+        
+        # 静态图层置于最底层，之后的刷新只修改 dynamic 标签的画布项
+        self.canvas.tag_lower("static")
+    
+    def _font(self, family: str, size: int, weight: str = 'normal') -> tkfont.Font:
+        """获取画布文字使用的字体对象，同一规格只创建一次，避免 Tk 每次重新解析字体描述"""
+        key = (family, size, weight)
+        font = self._font_cache.get(key)
+        if font is None:
+            font = self._font_cache[key] = tkfont.Font(root=self.root, family=family, size=size, weight=weight)
+        return font
+    
+    def _render_board_image(self, layout: tuple) -> Image.Image:
+        """把渐变背景、装饰边框和每个格子的静态图形合成为整张棋盘图像"""
+        board = self._render_gradient().convert('RGBA')
+        draw = ImageDraw.Draw(board)
+        size = self.canvas_size
+        
+        # 绘制装饰性边框
+        border_width = 8
+        draw.rectangle((0, 0, size - 1, size - 1), outline='#8B4513', width=border_width)
+        
+        # 绘制内部装饰边框
+        inner_border = border_width + 4
+        draw.rectangle((inner_border - 1, inner_border - 1, size - inner_border + 1, size - inner_border + 1),
+                       outline='#FFD700', width=2)
+        
+        # 绘制地图格子，后绘制的格子覆盖前一个格子的阴影
+        for (x, y), (cell_type, has_price) in zip(self._cell_xy, layout):
+            board.alpha_composite(self._get_cell_chrome(cell_type, has_price), (x - _CHROME_PAD, y - _CHROME_PAD))
+        return board
+    
+    def _on_board_click(self, event):
+        """根据点击坐标找到对应的格子"""
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        cs = self.cell_size
+        for i in range(len(self._board_cells) - 1, -1, -1):
+            cell_x, cell_y = self._cell_xy[i]
+            if cell_x <= x <= cell_x + cs and cell_y <= y <= cell_y + cs:
+                self._on_cell_click(i)
+                return
+    
+    def _get_cell_chrome(self, cell_type: CellType, has_price: bool) -> Image.Image:
+        """获取格子的预渲染静态图形，同类格子共用一张图像"""
+        key = (cell_type, has_price)
+        chrome = self._chrome_cache.get(key)
+        if chrome is None:
+            chrome = self._chrome_cache[key] = self._render_cell_chrome(cell_type, has_price)
+        return chrome
+    
+    def _render_cell_chrome(self, cell_type: CellType, has_price: bool) -> Image.Image:
+        """把格子的阴影、底色、高光、边框、角落和特殊图标绘制到透明图像上"""
+        cs = self.cell_size
+        o = _CHROME_PAD  # 格子左上角在图像中的坐标
+        image = Image.new('RGBA', (cs + o + 4, cs + o + 4), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        color = self._get_cell_color(cell_type)
+        
+        # 深层阴影效果
+        draw.rectangle((o + 3, o + 3, o + cs + 2, o + cs + 2), fill='#404040')
+        # 主格子 - 加强边框（画布的边框以边线为中心，这里向外扩展 1 像素与之对齐）
+        draw.rectangle((o - 1, o - 1, o + cs + 1, o + cs + 1), fill=color, outline='#1C1C1C', width=3)
+        # 渐变效果 - 顶部高光
+        draw.rectangle((o + 2, o + 2, o + cs - 3, o + 7), fill=self._get_highlight_color(color))
+        # 内边框装饰 - 金色边框
+        draw.rectangle((o + 4, o + 4, o + cs - 4, o + cs - 4), outline='#FFD700', width=1)
+        # 角落装饰
+        corner_size = 6
+        draw.rectangle((o + 2, o + 2, o + corner_size, o + corner_size), fill='#FFD700', outline='#B8860B')
+        draw.rectangle((o + cs - corner_size, o + 2, o + cs - 2, o + corner_size), fill='#FFD700', outline='#B8860B')
+        
+        # 特殊格子的额外装饰
+        if cell_type == CellType.START:
+            # 大型起点标识背景
+            draw.rectangle((o + 2, o + 2, o + cs - 2, o + 25), fill='#FF4500', outline='#8B0000', width=2)
+            # 钱币图标
+            draw.ellipse((o + 50, o + 32, o + 65, o + 47), fill='#FFD700', outline='#000000', width=2)
+        elif cell_type in (CellType.CHANCE, CellType.MISFORTUNE):
+            # 卡片样式
+            draw.rectangle((o + 5, o + 5, o + 15, o + 15), fill='#FFFFFF', outline='#000000', width=2)
+        elif cell_type == CellType.JAIL:
+            # 监狱图标和栅栏
+            draw.rectangle((o + 5, o + 5, o + 15, o + 15), fill='#696969', outline='#000000', width=2)
+            for bar_x in range(o + 7, o + 19, 3):
+                draw.line((bar_x, o + 7, bar_x, o + 18), fill='#000000', width=1)
+        elif cell_type == CellType.TAX:
+            # 税收图标
+            draw.polygon((o + 5, o + 15, o + 10, o + 5, o + 15, o + 15), fill='#FF0000', outline='#000000', width=2)
+        
+        # 价格背景框
+        if has_price:
+            draw.rectangle((o + 5, o + cs - 18, o + cs - 5, o + cs - 4), fill='#FFFF99', outline='#FFD700')
+        return image
+    
+    def _refresh_board(self):
+        """刷新棋盘动态部分：只更新所有权或等级发生变化的格子"""
+        cells = self._board_cells
+        if not cells:
+            return
+        
+        self._sync_player_colors()
+        for i, cell in enumerate(cells):
+            state = self._get_owner_state(cell)
+            if state != self._cell_state.get(i):
+                self._cell_state[i] = state
+                self._update_cell_owner(i, state)
         
         # 绘制玩家
         self._draw_players()
         
-        # 绘制中央区域的游戏信息
-        self._draw_center_info()
+        # 更新中央区域的游戏信息
+        self._update_center_info()
+    
+    def _sync_player_colors(self):
+        """玩家名单或顺序（开局时会打乱）变化时重建玩家颜色映射和所有者显示信息"""
+        players = self.game_manager.players
+        roster = tuple((p.id, p.name) for p in players)
+        if roster != self._color_roster:
+            self._color_roster = roster
+            colors = self.player_colors
+            self._player_color_by_id = {}
+            self._owner_info = {}
+            for i, player in enumerate(players):
+                color = colors[i % len(colors)]
+                self._player_color_by_id[player.id] = color
+                # 所有者显示信息：(颜色, 名称首字母, 是否深色, 深色边框, 浅色高光)
+                self._owner_info[player.id] = (color, player.name[0] if player.name else '?', self._is_dark_color(color),
+                                               self._get_darker_color(color), self._get_lighter_color(color))
     
-    def _draw_center_info(self):
-        """在地图中央显示游戏基本信息"""
+    def _get_owner_state(self, cell) -> Optional[tuple]:
+        """获取格子的所有权显示状态：(所有者显示信息, 等级文字)，无主时为 None"""
+        if cell.owner_id is None or cell.cell_type not in _OWNABLE_TYPES:
+            return None
+        info = self._owner_info.get(cell.owner_id)
+        if info is None:
+            return None
+        # 显示房产等级（仅限房产类型）
+        level_text = None
+        if cell.cell_type == CellType.PROPERTY:
+            level_text = "★" * cell.level if cell.level > 0 else "○"
+        return info, level_text
+    
+    def _update_cell_owner(self, index: int, state: Optional[tuple]):
+        """更新格子的所有权和等级覆盖层，首次需要时创建画布项，之后只修改属性"""
+        items = self._cell_items.get(index)
+        if state is None:
+            if items:
+                self.canvas.itemconfigure(f"cell{index}", state=tk.HIDDEN)
+            return
+        
+        (owner_color, initial, is_dark, darker, lighter), level_text = state
+        x, y = self._cell_xy[index]
+        if items is None:
+            items = self._cell_items[index] = {}
+            # 绘制玩家颜色边框表示所有权
+            items['border'] = self.canvas.create_rectangle(x + 1, y + 1, x + self.cell_size - 1, y + self.cell_size - 1,
+                                                          fill='', width=4, tags=("dynamic", f"cell{index}"))
+            # 在左上角绘制玩家颜色标识
+            items['tag'] = self.canvas.create_rectangle(x + 3, y + 3, x + 20, y + 20,
+                                                       outline='#000000', width=2, tags=("dynamic", f"cell{index}"))
+            # 在颜色标识中显示玩家名称首字母
+            items['initial'] = self.canvas.create_text(x + 11, y + 11, font=self._font('Arial', 10, 'bold'),
+                                                      anchor=tk.CENTER, fill='white', tags=("dynamic", f"cell{index}"))
+            # 玩家图标保持在覆盖层之上
+            self.canvas.tag_raise("player")
+        
+        self.canvas.itemconfigure(items['border'], outline=owner_color, state=tk.NORMAL)
+        self.canvas.itemconfigure(items['tag'], fill=owner_color, state=tk.NORMAL)
+        self.canvas.itemconfigure(items['initial'], text=initial, state=tk.NORMAL)
+        
+        if level_text is None:
+            return
+        
+        # 房产等级样式根据购买者颜色区分
+        if 'level_bg' not in items:
+            # 现代化圆角矩形背景
+            items['level_bg'] = self.canvas.create_rectangle(x + self.cell_size - 22, y + 2, x + self.cell_size - 2, y + 18,
+                                                            width=2, tags=("dynamic", f"cell{index}"))
+            # 添加内部高光效果
+            items['level_highlight'] = self.canvas.create_rectangle(x + self.cell_size - 20, y + 4, x + self.cell_size - 4, y + 8,
+                                                                   outline='', width=0, tags=("dynamic", f"cell{index}"))
+            items['level_text'] = self.canvas.create_text(x + self.cell_size - 12, y + 10,
+                                                         font=self._font('Arial', 8, 'bold'), anchor=tk.CENTER, tags=("dynamic", f"cell{index}"))
+            self.canvas.tag_raise("player")
+        
+        self.canvas.itemconfigure(items['level_bg'], fill=owner_color, outline=darker, state=tk.NORMAL)
+        self.canvas.itemconfigure(items['level_highlight'], fill=lighter, state=tk.NORMAL)
+        self.canvas.itemconfigure(items['level_text'], text=level_text, state=tk.NORMAL,
+                                  fill='#FFFFFF' if is_dark else '#000000')
+    
+    def _create_center_info(self):
+        """在地图中央创建游戏信息的画布项，角色和回合数之后由 _update_center_info 修改"""
         # 计算中央区域
         center_x = self.canvas_size // 2
         center_y = self.canvas_size // 2
@@ -522,198 +763,222 @@ class GameGUI(EventObserver):
         radius = 150
         self.canvas.create_oval(center_x - radius, center_y - radius, 
                                center_x + radius, center_y + radius,
-                               fill='#F5F5DC', outline='#FFD700', width=3)
+                               fill='#F5F5DC', outline='#FFD700', width=3, tags="static")
         
         # 显示游戏名称
         self.canvas.create_text(center_x, center_y - 60, text="大富翁", 
-                               font=('微软雅黑', 36, 'bold'), fill='#8B4513')
-        
-        # 显示当前角色
-        current_player = self.game_manager.get_current_player()
-        if current_player:
-            player_text = f"当前角色: {current_player.name}"
-            player_color = self.player_colors[self.game_manager.players.index(current_player) % len(self.player_colors)]
-            
-            # 创建角色信息背景
-            self.canvas.create_rectangle(center_x - 120, center_y - 10, 
-                                       center_x + 120, center_y + 20,
-                                       fill='#FFFFFF', outline=player_color, width=2)
-            
-            self.canvas.create_text(center_x, center_y + 5, text=player_text, 
-                                   font=('微软雅黑', 14), fill=player_color)
+                               font=self._font('微软雅黑', 36, 'bold'), fill='#8B4513', tags="static")
+        
+        # 当前角色信息背景和文字（没有当前角色时隐藏）
+        self._center_items = {
+            'player_bg': self.canvas.create_rectangle(center_x - 120, center_y - 10, 
+                                                      center_x + 120, center_y + 20,
+                                                      fill='#FFFFFF', width=2, state=tk.HIDDEN, tags="dynamic"),
+            'player_text': self.canvas.create_text(center_x, center_y + 5, 
+                                                   font=self._font('微软雅黑', 14), state=tk.HIDDEN, tags="dynamic")
+        }
         
-        # 显示回合数
-        turn_text = f"回合数: {self.game_manager.turn_count}"
+        # 回合数
         self.canvas.create_rectangle(center_x - 80, center_y + 40, 
                                    center_x + 80, center_y + 70,
-                                   fill='#FFFFFF', outline='#4169E1', width=2)
-        self.canvas.create_text(center_x, center_y + 55, text=turn_text, 
-                               font=('微软雅黑', 14), fill='#4169E1')
+                                   fill='#FFFFFF', outline='#4169E1', width=2, tags="static")
+        self._center_items['turn_text'] = self.canvas.create_text(center_x, center_y + 55, 
+                                                                 font=self._font('微软雅黑', 14), fill='#4169E1', tags="dynamic")
+        self._center_state = None
+    
+    def _update_center_info(self):
+        """更新中央区域的当前角色和回合数，内容未变化时不做任何修改"""
+        current_player = self.game_manager.get_current_player()
+        player = (current_player.name, self._player_color_by_id[current_player.id]) if current_player else None
+        state = (player, self.game_manager.turn_count)
+        if state == self._center_state:
+            return
+        self._center_state = state
+        
+        items = self._center_items
+        if player:
+            name, player_color = player
+            self.canvas.itemconfigure(items['player_bg'], outline=player_color, state=tk.NORMAL)
+            self.canvas.itemconfigure(items['player_text'], text=f"当前角色: {name}",
+                                      fill=player_color, state=tk.NORMAL)
+        else:
+            self.canvas.itemconfigure(items['player_bg'], state=tk.HIDDEN)
+            self.canvas.itemconfigure(items['player_text'], state=tk.HIDDEN)
+        self.canvas.itemconfigure(items['turn_text'], text=f"回合数: {self.game_manager.turn_count}")
     
-    def _get_cell_position(self, index: int, cells_per_side: int, board_size: int) -> tuple:
-        """获取格子在画布上的位置"""
+    def _build_position_table(self, cells_per_side: int, board_size: int, positions: int = 40) -> tuple:
+        """沿四条边走一遍，生成每个位置对应的格子左上角坐标"""
         # 调整基础偏移量以适应装饰边框
         border_offset = 20  # 8px边框 + 4px内边框 + 8px间距
-        base_x, base_y = border_offset, border_offset
-        
-        # 调整board_size以适应新的边框
         adjusted_board_size = board_size - (border_offset * 2)
+        cs = self.cell_size
+        near = border_offset
+        far = border_offset + adjusted_board_size - cs
+        edge = cells_per_side - 1  # 每条边的格子数（角落格子算作该边的第一个）
         
         # 标准36格大富翁布局（每边10个格子，角落格子属于两边）：
-        # 右下角（起点）：位置1（索引0）
-        # 下边：位置1-9（索引0-8）(9个格子，不包括角落)
-        # 左下角（监狱）：位置10（索引9）
-        # 左边：位置10-18（索引9-17）(9个格子，不包括角落)
-        # 左上角（免费停车）：位置19（索引18）
-        # 上边：位置19-27（索引18-26）(9个格子，不包括角落)
-        # 右上角（进监狱）：位置28（索引27）
-        # 右边：位置28-36（索引27-35）(9个格子，不包括角落)
-        
-        # 玩家位置从0开始，地图位置从1开始，需要转换
-        # 位置0对应地图位置1（起点）
-        position = index + 1
-        
-            
-        if position == 1:  # 右下角（起点）
-            x = base_x + adjusted_board_size - self.cell_size
-            y = base_y + adjusted_board_size - self.cell_size
-            return x, y
-        elif 1 < position <= 9:  # 下边 (2-9)
-            x = base_x + adjusted_board_size - self.cell_size - ((position - 1) * self.cell_size)
-            y = base_y + adjusted_board_size - self.cell_size
-            return x, y
-        elif position == 10:  # 左下角（监狱）
-            x = base_x
-            y = base_y + adjusted_board_size - self.cell_size
-            return x, y
-        elif 10 < position <= 18:  # 左边 (11-18)
-            x = base_x
-            y = base_y + adjusted_board_size - self.cell_size - ((position - 10) * self.cell_size)
-            return x, y
-        elif position == 19:  # 左上角（免费停车）
-            x = base_x
-            y = base_y
-            return x, y
-        elif 19 < position <= 27:  # 上边 (20-27)
-            x = base_x + ((position - 19) * self.cell_size)
-            y = base_y
-            return x, y
-        elif position == 28:  # 右上角（进监狱）
-            x = base_x + adjusted_board_size - self.cell_size
-            y = base_y
-            return x, y
-        elif 28 < position <= 36:  # 右边 (29-35)
-            x = base_x + adjusted_board_size - self.cell_size
-            y = base_y + ((position - 28) * self.cell_size)
-            return x, y
-        else:
-            # 默认返回起点位置
-            x = base_x + adjusted_board_size - self.cell_size
-            y = base_y + adjusted_board_size - self.cell_size
-            return x, y
+        # 下边：从右下角（起点，索引0）向左，左下角为监狱（索引9）
+        # 左边：从左下角向上，左上角为免费停车（索引18）
+        # 上边：从左上角向右，右上角为进监狱（索引27）
+        # 右边：从右上角向下回到起点
+        table = [(far - k * cs, far) for k in range(edge)]
+        table += [(near, far - k * cs) for k in range(edge)]
+        table += [(near + k * cs, near) for k in range(edge)]
+        table += [(far, near + k * cs) for k in range(edge)]
+        
+        # 超出标准布局的位置显示在起点
+        table += [table[0]] * (positions - len(table))
+        return tuple(table)
     
-    def _get_cell_color(self, cell_type: CellType) -> str:
+    @staticmethod
+    def _get_cell_color(cell_type: CellType) -> str:
         """获取格子颜色 - 豪华大富翁配色方案"""
-        colors = {
-            CellType.START: '#FFD700',      # 金色 - 起点
-            CellType.PROPERTY: '#4169E1',   # 皇家蓝 - 房产
-            CellType.AIRPORT: '#FF4500',    # 橙红色 - 机场
-            CellType.UTILITY: '#C0C0C0',    # 银色 - 公用事业
-            CellType.LANDMARK: '#8A2BE2',   # 蓝紫色 - 地标
-            CellType.CHANCE: '#FF69B4',     # 热粉色 - 机会
-            CellType.MISFORTUNE: '#FF8C00', # 深橙色 - 命运
-            CellType.TAX: '#B22222',        # 火砖红 - 税务
-            CellType.JAIL: '#708090',       # 石板灰 - 监狱
-            CellType.GO_TO_JAIL: '#2F4F4F', # 暗石板灰 - 进监狱
-            CellType.FREE_PARKING: '#FFD700' # 金色 - 免费停车
-        }
-        return colors.get(cell_type, '#FFFFFF')
+        return _CELL_COLORS.get(cell_type, '#FFFFFF')
     
-    def _get_highlight_color(self, base_color: str) -> str:
+    @staticmethod
+    def _get_highlight_color(base_color: str) -> str:
         """获取高光颜色 - 用于渐变效果"""
-        # 将十六进制颜色转换为RGB，然后增加亮度
-        hex_color = base_color.lstrip('#')
-        rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        
-        # 增加亮度（最大255）
-        highlight_rgb = tuple(min(255, int(c * 1.3)) for c in rgb)
-        
-        # 转换回十六进制
-        return '#{:02x}{:02x}{:02x}'.format(*highlight_rgb)
-    
-    def _draw_gradient_background(self):
-        """绘制渐变背景"""
-        # 创建从浅色到深色的渐变效果
-        steps = 50
-        for i in range(steps):
-            # 计算渐变颜色
-            ratio = i / steps
-            # 从浅米色到深米色的渐变
-            r = int(245 - ratio * 30)  # 245 -> 215
-            g = int(245 - ratio * 35)  # 245 -> 210
-            b = int(220 - ratio * 40)  # 220 -> 180
-            
-            color = '#{:02x}{:02x}{:02x}'.format(r, g, b)
-            
-            # 绘制渐变条带
-            y1 = i * (self.canvas_size // steps)
-            y2 = (i + 1) * (self.canvas_size // steps)
+        highlight = _HIGHLIGHTS.get(base_color)
+        return highlight if highlight is not None else _compute_highlight(base_color)
+    
+    def _render_gradient(self) -> Image.Image:
+        """生成渐变背景图像（只生成一次）"""
+        if self._bg_image is None:
+            # 创建从浅色到深色的渐变效果
+            steps = 50
+            strip_height = self.canvas_size // steps
+            colors = []
+            for i in range(steps):
+                # 计算渐变颜色
+                ratio = i / steps
+                # 从浅米色到深米色的渐变
+                r = int(245 - ratio * 30)  # 245 -> 215
+                g = int(245 - ratio * 35)  # 245 -> 210
+                b = int(220 - ratio * 40)  # 220 -> 180
+                colors.append((r, g, b))
             
-            self.canvas.create_rectangle(0, y1, self.canvas_size, y2,
-                                       fill=color, outline=color)
+            # 每个条带一个像素，纵向按最近邻放大为完整的渐变条带
+            strips = Image.new('RGB', (1, steps))
+            strips.putdata(colors)
+            self._bg_image = strips.resize((self.canvas_size, steps * strip_height), Image.NEAREST)
+        return self._bg_image
     
     def _draw_players(self):
-        """绘制玩家"""
-        # 清除之前的玩家图标
-        self.canvas.delete("player")
-        
-        for i, player in enumerate(self.game_manager.players):
-            if player.is_bankrupt:
-                continue
-            
-            # 获取玩家位置 - 使用与_draw_board相同的参数
-            cells_per_side = 10  # 标准大富翁布局每边10个格子
-            border_offset = 20
-            board_size = self.canvas_size - (border_offset * 2)
-            cell_x, cell_y = self._get_cell_position(player.position, cells_per_side, board_size)
+        """绘制玩家：图标只创建一次，之后随位置移动，并按监狱/破产状态切换显示"""
+        players = self.game_manager.players
+        roster = tuple((p.id, p.name) for p in players)
+        if roster != self._token_roster:
+            # 玩家名单或顺序变化时（颜色和格内偏移随之变化）重建所有图标
+            self.canvas.delete("player")
+            self._player_tokens = {}
+            self._token_roster = roster
+        
+        for i, player in enumerate(players):
+            # 获取玩家位置 - 与_draw_board使用同一份预先计算的坐标
+            cell_x, cell_y = self._cell_xy[player.position]
             
             # 计算玩家在格子内的偏移
-            offset_x = (i % 2) * 20 + 10
-            offset_y = (i // 2) * 20 + 10
+            player_x = cell_x + (i % 2) * 20 + 10
+            player_y = cell_y + (i // 2) * 20 + 10
             
-            player_x = cell_x + offset_x
-            player_y = cell_y + offset_y
+            # 破产玩家隐藏图标，在监狱中显示特殊标记
+            state = None if player.is_bankrupt else ('jail' if player.is_in_jail else 'free')
             
-            # 绘制玩家图标 - 3D效果
-            color = self.player_colors[i % len(self.player_colors)]
+            token = self._player_tokens.get(player.id)
+            if token is None:
+                self._player_tokens[player.id] = self._create_player_token(i, player, player_x, player_y, state)
+                continue
             
-            # 如果在监狱，显示特殊标记
-            if player.is_in_jail:
-                # 绘制监狱栅栏效果
-                self.canvas.create_rectangle(player_x-10, player_y-10, player_x+10, player_y+10,
-                                           fill='#696969', outline='#000000', width=2, tags="player")
-                # 绘制栅栏
-                for bar_x in range(player_x-8, player_x+9, 4):
-                    self.canvas.create_line(bar_x, player_y-8, bar_x, player_y+8, 
-                                          fill='#000000', width=2, tags="player")
-                self.canvas.create_text(player_x, player_y, text="囚", 
-                                      font=('微软雅黑', 8, 'bold'), fill='#FFFFFF', tags="player")
-            else:
-                # 绘制阴影
-                self.canvas.create_oval(player_x-7, player_y-7, player_x+9, player_y+9,
-                                      fill='#808080', outline='', tags="player")
-                # 绘制主体
-                self.canvas.create_oval(player_x-8, player_y-8, player_x+8, player_y+8,
-                                      fill=color, outline='#000000', width=2, tags="player")
-                # 绘制高光效果
-                self.canvas.create_oval(player_x-6, player_y-6, player_x-2, player_y-2,
-                                      fill='#FFFFFF', outline='', tags="player")
-                # 绘制玩家编号
-                self.canvas.create_text(player_x, player_y+1, text=str(player.id), 
-                                      font=('Arial', 8, 'bold'), fill='#FFFFFF', tags="player")
-                # 绘制玩家名称（在图标下方）
-                self.canvas.create_text(player_x, player_y+18, text=player.name[:3], 
-                                      font=('微软雅黑', 6), fill='#000000', tags="player")
+            if (player_x, player_y) != token['target']:
+                self._start_token_animation(player.id, token, player.position, player_x - cell_x, player_y - cell_y)
+            
+            if state != token['state']:
+                if token['state']:
+                    self.canvas.itemconfigure(f"{token['tag']}_{token['state']}", state='hidden')
+                if state:
+                    self.canvas.itemconfigure(f"{token['tag']}_{state}", state='normal')
+                token['state'] = state
+    
+    def _create_player_token(self, index: int, player: Player, player_x: int, player_y: int,
+                             state: Optional[str]) -> Dict[str, Any]:
+        """创建玩家图标的两组画布项（普通/监狱），只显示与当前状态对应的一组"""
+        tag = f"token{player.id}"
+        color = self.player_colors[index % len(self.player_colors)]
+        
+        # 监狱中的图标 - 绘制监狱栅栏效果
+        tags = ("dynamic", "player", tag, f"{tag}_jail")
+        shown = 'normal' if state == 'jail' else 'hidden'
+        self.canvas.create_rectangle(player_x-10, player_y-10, player_x+10, player_y+10,
+                                   fill='#696969', outline='#000000', width=2, tags=tags, state=shown)
+        # 绘制栅栏
+        for bar_dx in _JAIL_BAR_DX:
+            self.canvas.create_line(player_x + bar_dx, player_y-8, player_x + bar_dx, player_y+8, 
+                                  fill='#000000', width=2, tags=tags, state=shown)
+        self.canvas.create_text(player_x, player_y, text="囚", 
+                              font=self._font('微软雅黑', 8, 'bold'), fill='#FFFFFF', tags=tags, state=shown)
+        
+        # 普通图标 - 3D效果
+        tags = ("dynamic", "player", tag, f"{tag}_free")
+        shown = 'normal' if state == 'free' else 'hidden'
+        # 绘制阴影
+        self.canvas.create_oval(player_x-7, player_y-7, player_x+9, player_y+9,
+                              fill='#808080', outline='', tags=tags, state=shown)
+        # 绘制主体
+        self.canvas.create_oval(player_x-8, player_y-8, player_x+8, player_y+8,
+                              fill=color, outline='#000000', width=2, tags=tags, state=shown)
+        # 绘制高光效果
+        self.canvas.create_oval(player_x-6, player_y-6, player_x-2, player_y-2,
+                              fill='#FFFFFF', outline='', tags=tags, state=shown)
+        # 绘制玩家编号
+        self.canvas.create_text(player_x, player_y+1, text=str(player.id), 
+                              font=self._font('Arial', 8, 'bold'), fill='#FFFFFF', tags=tags, state=shown)
+        # 绘制玩家名称（在图标下方）
+        self.canvas.create_text(player_x, player_y+18, text=player.name[:3], 
+                              font=self._font('微软雅黑', 6), fill='#000000', tags=tags, state=shown)
+        
+        return {'tag': tag, 'cell': player.position, 'pos': (player_x, player_y), 'target': (player_x, player_y),
+                'state': state, 'path': None}
+    
+    def _start_token_animation(self, player_id: int, token: Dict[str, Any], position: int,
+                               offset_x: int, offset_y: int):
+        """让玩家图标从当前位置平滑移动到新格子：前进时逐格经过，其余情况（撤销、进监狱等）直线移动"""
+        cell_count = len(self._board_cells)
+        steps = (position - token['cell']) % cell_count
+        if 0 < steps <= _TOKEN_WALK_MAX_STEPS:
+            cells = [(token['cell'] + k) % cell_count for k in range(1, steps + 1)]
+        else:
+            cells = [position]
+        
+        # 依次经过的途经点，相邻途经点之间按固定帧数插值
+        path = []
+        x0, y0 = token['pos']
+        frames = _TOKEN_FRAMES_PER_CELL if len(cells) > 1 else _TOKEN_FRAMES_PER_CELL * 2
+        for cell in cells:
+            cell_x, cell_y = self._cell_xy[cell]
+            x1, y1 = cell_x + offset_x, cell_y + offset_y
+            path.extend((x0 + (x1 - x0) * f // frames, y0 + (y1 - y0) * f // frames) for f in range(1, frames + 1))
+            x0, y0 = x1, y1
+        
+        token['cell'] = position
+        token['target'] = (x0, y0)
+        token['path'] = path
+        self._animate_token(player_id, path)
+    
+    def _animate_token(self, player_id: int, path: list, step: int = 0):
+        """动画的一帧：把图标移到路径上的下一个点，约每 16 毫秒一帧，期间不重绘棋盘"""
+        token = self._player_tokens.get(player_id)
+        if token is None or token['path'] is not path:
+            return  # 棋盘已重建或有新的移动，本次动画作废
+        
+        x, y = path[step]
+        old_x, old_y = token['pos']
+        self.canvas.move(token['tag'], x - old_x, y - old_y)
+        token['pos'] = (x, y)
+        
+        if step + 1 < len(path):
+            self.root.after(16, self._animate_token, player_id, path, step + 1)
+        else:
+            token['path'] = None
     
     def _on_cell_click(self, position: int):
         """处理格子点击事件"""
@@ -747,9 +1012,13 @@ class GameGUI(EventObserver):
             else:
                 self._log(f"{current_player.name} 出狱了！", 'success')
         
+        # 本回合之后的命令合并为一条历史记录，在结束回合时写入
+        self.game_manager.begin_batch()
+        self._update_undo_redo_buttons()
+        
         # 投掷骰子
         dice1, dice2, total = self.game_manager.roll_dice()
-        self.dice_label.config(text=f"骰子: {dice1} + {dice2} = {total}")
+        self._config_if_changed(self.dice_label, text=f"骰子: {dice1} + {dice2} = {total}")
         
         # 移动玩家
         move_result = self.game_manager.move_player(current_player, total)
@@ -758,9 +1027,7 @@ class GameGUI(EventObserver):
         landing_result = self.game_manager.process_landing(current_player)
         
         # 更新界面
-        self._draw_board()
-        self._update_player_list()
-        self._update_game_info()
+        self._mark_dirty('players', 'info', 'board')
         
         # 处理落地结果
         self._handle_landing_result(landing_result)
@@ -770,41 +1037,53 @@ class GameGUI(EventObserver):
             self.root.after(1000, self._handle_ai_actions)
         
         # 禁用骰子按钮
-        self.roll_button.config(state=tk.DISABLED)
+        self._config_if_changed(self.roll_button, state=tk.DISABLED)
     
     def _handle_landing_result(self, result: Dict[str, Any]):
-        """处理落地结果"""
-        result_type = result.get("type")
-        
-        if result_type == "purchase_option":
-            if result["can_purchase"]:
-                self.buy_button.config(state=tk.NORMAL)
-                self._log(f"可以购买 {result['cell'].name}，价格: {result['price']}", 'trade')
-            else:
-                self._log(f"资金不足，无法购买 {result['cell'].name}", 'warning')
-        
-        elif result_type == "upgrade_option":
-            if result["can_upgrade"]:
-                self.upgrade_button.config(state=tk.NORMAL)
-                self._log(f"可以升级 {result['cell'].name}，费用: {result['upgrade_cost']}", 'trade')
-            else:
-                self._log(f"无法升级 {result['cell'].name}", 'warning')
-        
-        elif result_type == "rent_paid":
-            self._log(f"支付租金 {result['rent']} 给 {result['owner']}", 'trade')
-        
-        elif result_type == "chance_event" or result_type == "misfortune_event":
-            event_result = result["event_result"]
-            self._show_event_dialog(event_result)
-        
-        elif result_type == "tax_paid":
-            self._log(f"缴纳{result['tax_type']} {result['tax_amount']} 金币", 'trade')
-        
-        elif result_type == "go_to_jail":
-            self._log(result["message"])
+        """处理落地结果：按结果类型分派给对应的处理方法"""
+        handler = self._LANDING_HANDLERS.get(result.get("type"))
+        if handler:
+            handler(self, result)
         
         # 启用结束回合按钮
-        self.end_turn_button.config(state=tk.NORMAL)
+        self._config_if_changed(self.end_turn_button, state=tk.NORMAL)
+    
+    # 落地结果处理方法，签名统一为 (self, 落地结果)
+    def _on_purchase_option(self, result: Dict[str, Any]):
+        if result["can_purchase"]:
+            self._config_if_changed(self.buy_button, state=tk.NORMAL)
+            self._log(f"可以购买 {result['cell'].name}，价格: {result['price']}", 'trade')
+        else:
+            self._log(f"资金不足，无法购买 {result['cell'].name}", 'warning')
+    
+    def _on_upgrade_option(self, result: Dict[str, Any]):
+        if result["can_upgrade"]:
+            self._config_if_changed(self.upgrade_button, state=tk.NORMAL)
+            self._log(f"可以升级 {result['cell'].name}，费用: {result['upgrade_cost']}", 'trade')
+        else:
+            self._log(f"无法升级 {result['cell'].name}", 'warning')
+    
+    def _on_rent_paid(self, result: Dict[str, Any]):
+        self._log(f"支付租金 {result['rent']} 给 {result['owner']}", 'trade')
+    
+    def _on_event_landing(self, result: Dict[str, Any]):
+        self._show_event_dialog(result["event_result"])
+    
+    def _on_tax_paid(self, result: Dict[str, Any]):
+        self._log(f"缴纳{result['tax_type']} {result['tax_amount']} 金币", 'trade')
+    
+    def _on_go_to_jail(self, result: Dict[str, Any]):
+        self._log(result["message"])
+    
+    _LANDING_HANDLERS = {
+        "purchase_option": _on_purchase_option,
+        "upgrade_option": _on_upgrade_option,
+        "rent_paid": _on_rent_paid,
+        "chance_event": _on_event_landing,
+        "misfortune_event": _on_event_landing,
+        "tax_paid": _on_tax_paid,
+        "go_to_jail": _on_go_to_jail,
+    }
     
     def _show_event_dialog(self, event_result: Dict[str, Any]):
         """显示事件对话框"""
@@ -825,9 +1104,8 @@ class GameGUI(EventObserver):
         
         cell = self.game_manager.get_cell_at_position(current_player.position)
         if cell and self.game_manager.purchase_property(current_player, cell):
-            self._update_player_list()
-            self._draw_board()
-            self.buy_button.config(state=tk.DISABLED)
+            self._mark_dirty('players', 'board')
+            self._config_if_changed(self.buy_button, state=tk.DISABLED)
         else:
             messagebox.showerror("错误", "购买失败")
     
@@ -839,9 +1117,8 @@ class GameGUI(EventObserver):
         
         cell = self.game_manager.get_cell_at_position(current_player.position)
         if cell and self.game_manager.upgrade_property(current_player, cell):
-            self._update_player_list()
-            self._draw_board()
-            self.upgrade_button.config(state=tk.DISABLED)
+            self._mark_dirty('players', 'board')
+            self._config_if_changed(self.upgrade_button, state=tk.DISABLED)
         else:
             messagebox.showerror("错误", "升级失败")
     
@@ -862,21 +1139,23 @@ class GameGUI(EventObserver):
             self._end_turn()
             return
         
-        # AI决策
-        if cell.owner_id is None and cell.cell_type in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY, CellType.LANDMARK]:
-            # 购买决策
-            if ai_player.make_purchase_decision(cell, self.game_manager.get_game_state_dict()):
-                if self.game_manager.purchase_property(current_player, cell):
-                    self._update_player_list()
-                    self._draw_board()
-        
-        elif cell.owner_id == current_player.id and cell.can_upgrade():
-            # 升级决策
-            upgrade_position = ai_player.make_upgrade_decision(self.game_manager.map_cells)
-            if upgrade_position == cell.position:
-                if self.game_manager.upgrade_property(current_player, cell):
-                    self._update_player_list()
-                    self._draw_board()
+        # AI决策（决策过程中的界面刷新合并为一次）
+        with self.batch_updates():
+            if cell.owner_id is None and cell.cell_type in [CellType.PROPERTY, CellType.AIRPORT, CellType.UTILITY, CellType.LANDMARK]:
+                # 购买决策
+                if ai_player.make_purchase_decision(cell, self.game_manager.get_game_state_dict()):
+                    if self.game_manager.purchase_property(current_player, cell):
+                        self._mark_dirty('players', 'board')
+        
+            elif cell.owner_id == current_player.id and cell.can_upgrade():
+                # 升级决策
+                # 只有普通房产可以升级，直接传入按类型分组的房产格子
+                upgrade_position = ai_player.make_upgrade_decision(
+                    self.game_manager.cells_by_type.get(CellType.PROPERTY, ())
+                )
+                if upgrade_position == cell.position:
+                    if self.game_manager.upgrade_property(current_player, cell):
+                        self._mark_dirty('players', 'board')
         
         # 延迟结束回合
         self.root.after(1500, self._end_turn)
@@ -887,14 +1166,16 @@ class GameGUI(EventObserver):
         current_player = self.game_manager.get_current_player()
         if current_player and current_player.check_bankruptcy():
             self._log(f"{current_player.name} 破产了！", 'error')
-            self._update_player_list()
+            self._mark_dirty('players')
+        
+        # 本回合的命令作为一步写入撤销历史
+        self.game_manager.end_batch()
+        self._update_undo_redo_buttons()
         
         # 切换到下一个玩家
         if self.game_manager.next_turn():
             # 立即更新UI显示新的当前玩家
-            self._update_game_info()
-            self._update_player_list()
-            self._draw_board()  # 重绘棋盘以突出显示新的当前玩家
+            self._mark_dirty('players', 'info', 'board')
             self._update_ui_state()
         else:
             # 游戏结束
@@ -916,9 +1197,7 @@ class GameGUI(EventObserver):
         result = self.game_manager.undo_last_action()
         if result.get("success", False):
             self._log(f"撤销操作: {result.get('message', '操作已撤销')}", 'info')
-            self._update_player_list()
-            self._draw_board()
-            self._update_game_info()
+            self._mark_dirty('players', 'info', 'board')
             
             # 只有撤销移动命令（掷骰子）时才重新启用掷骰子按钮
             command_type = result.get("command_type")
@@ -934,9 +1213,7 @@ class GameGUI(EventObserver):
         result = self.game_manager.redo_last_action()
         if result.get("success", False):
             self._log(f"重做操作: {result.get('message', '操作已重做')}", 'info')
-            self._update_player_list()
-            self._draw_board()
-            self._update_game_info()
+            self._mark_dirty('players', 'info', 'board')
             
             # 只有重做移动命令（掷骰子）时才重新启用掷骰子按钮
             command_type = result.get("command_type")
@@ -950,14 +1227,14 @@ class GameGUI(EventObserver):
     def _update_undo_redo_buttons(self):
         """更新撤销/重做按钮状态"""
         if self.game_manager.can_undo():
-            self.undo_button.config(state=tk.NORMAL)
+            self._config_if_changed(self.undo_button, state=tk.NORMAL)
         else:
-            self.undo_button.config(state=tk.DISABLED)
+            self._config_if_changed(self.undo_button, state=tk.DISABLED)
         
         if self.game_manager.can_redo():
-            self.redo_button.config(state=tk.NORMAL)
+            self._config_if_changed(self.redo_button, state=tk.NORMAL)
         else:
-            self.redo_button.config(state=tk.DISABLED)
+            self._config_if_changed(self.redo_button, state=tk.DISABLED)
     
     def _update_ui_state(self):
         """更新UI状态"""
@@ -970,45 +1247,57 @@ class GameGUI(EventObserver):
         if game_state == GameState.PLAYING and current_player:
             # 游戏进行中
             if current_player.player_type == PlayerType.HUMAN:
-                self.roll_button.config(state=tk.NORMAL)
+                self._config_if_changed(self.roll_button, state=tk.NORMAL)
             else:
-                self.roll_button.config(state=tk.DISABLED)
+                self._config_if_changed(self.roll_button, state=tk.DISABLED)
                 # AI自动投掷骰子
                 self.root.after(1000, self._roll_dice)
         else:
             # 游戏未开始或已结束
-            self.roll_button.config(state=tk.DISABLED)
+            self._config_if_changed(self.roll_button, state=tk.DISABLED)
         
-        self.buy_button.config(state=tk.DISABLED)
-        self.upgrade_button.config(state=tk.DISABLED)
-        self.end_turn_button.config(state=tk.DISABLED)
+        self._config_if_changed(self.buy_button, state=tk.DISABLED)
+        self._config_if_changed(self.upgrade_button, state=tk.DISABLED)
+        self._config_if_changed(self.end_turn_button, state=tk.DISABLED)
     
     def _update_player_list(self):
-        """更新玩家列表"""
-        # 清空列表
-        for item in self.player_tree.get_children():
-            self.player_tree.delete(item)
+        """更新玩家列表：每个玩家对应固定的行，只修改内容发生变化的行"""
+        players = self.game_manager.players
+        order = tuple(f"p{player.id}" for player in players)
         
-        # 添加玩家
-        for player in self.game_manager.players:
+        # 删除已不在游戏中的玩家行
+        for iid in set(self._player_rows) - set(order):
+            self.player_tree.delete(iid)
+            del self._player_rows[iid]
+        
+        for index, (iid, player) in enumerate(zip(order, players)):
             status = "💀" if player.is_bankrupt else ("🔒" if player.is_in_jail else "")
             player_name = f"{status}{player.name}"
             
             cell = self.game_manager.get_cell_at_position(player.position)
             position_name = cell.name if cell else "未知"
             
-            self.player_tree.insert('', 'end', text=player_name,
-                                  values=(f"${player.money}", len(player.properties), position_name))
+            row = (player_name, (f"${player.money}", len(player.properties), position_name))
+            if iid not in self._player_rows:
+                self.player_tree.insert('', index, iid=iid, text=row[0], values=row[1])
+            elif self._player_rows[iid] != row:
+                self.player_tree.item(iid, text=row[0], values=row[1])
+            self._player_rows[iid] = row
+        
+        # 玩家顺序变化时（开局会打乱顺序）调整行的位置
+        if order != self._player_row_order:
+            for index, iid in enumerate(order):
+                self.player_tree.move(iid, '', index)
+            self._player_row_order = order
     
     def _update_game_info(self):
         """更新游戏信息"""
         current_player = self.game_manager.get_current_player()
         if current_player:
-            self.current_player_label.config(text=f"{current_player.name}")
+            self._config_if_changed(self.current_player_label, text=f"{current_player.name}")
             
             # 更新游戏状态
-            if hasattr(self, 'game_status_label'):
-                self.game_status_label.config(text="游戏进行中", foreground='#28a745')
+            self._config_if_changed(self.game_status_label, text="游戏进行中", foreground='#28a745')
             
             cell = self.game_manager.get_cell_at_position(current_player.position)
             if cell:
@@ -1016,34 +1305,40 @@ class GameGUI(EventObserver):
                 # 根据格子类型设置颜色
                 if hasattr(cell, 'cell_type'):
                     if cell.cell_type == 'property':
-                        self.position_label.config(text=position_text, foreground='#8A2BE2')
+                        self._config_if_changed(self.position_label, text=position_text, foreground='#8A2BE2')
                     elif cell.cell_type == 'special':
-                        self.position_label.config(text=position_text, foreground='#FF6347')
+                        self._config_if_changed(self.position_label, text=position_text, foreground='#FF6347')
                     else:
-                        self.position_label.config(text=position_text, foreground='#17a2b8')
+                        self._config_if_changed(self.position_label, text=position_text, foreground='#17a2b8')
                 else:
-                    self.position_label.config(text=position_text, foreground='#8A2BE2')
+                    self._config_if_changed(self.position_label, text=position_text, foreground='#8A2BE2')
             else:
-                self.position_label.config(text=f"{current_player.position} - 未知", foreground='#dc3545')
+                self._config_if_changed(self.position_label, text=f"{current_player.position} - 未知", foreground='#dc3545')
         else:
-            self.current_player_label.config(text="无")
-            self.position_label.config(text="-")
-            if hasattr(self, 'game_status_label'):
-                self.game_status_label.config(text="等待开始", foreground='#FF8C00')
+            self._config_if_changed(self.current_player_label, text="无")
+            self._config_if_changed(self.position_label, text="-")
+            self._config_if_changed(self.game_status_label, text="等待开始", foreground='#FF8C00')
         
-        self.turn_label.config(text=f"{self.game_manager.turn_count}")
+        self._config_if_changed(self.turn_label, text=f"{self.game_manager.turn_count}")
         
         # 更新骰子显示
-        if hasattr(self.game_manager, 'last_dice_result') and self.game_manager.last_dice_result:
-            dice1, dice2, total = self.game_manager.last_dice_result
+        dice_result = self.game_manager.last_dice_result
+        if dice_result:
+            dice1, dice2, total = dice_result
             dice_text = f"骰子: {dice1} + {dice2} = {total}"
             if total == 12:  # 双6
                 dice_text += " 🎉"
             elif dice1 == dice2:  # 双数
                 dice_text += " 🎲"
-            self.dice_label.config(text=dice_text)
+            self._config_if_changed(self.dice_label, text=dice_text)
         else:
-            self.dice_label.config(text="骰子: -")
+            self._config_if_changed(self.dice_label, text="骰子: -")
+    
+    def _config_if_changed(self, widget, **options):
+        """仅在选项与上次设置的不同时才配置控件，相同文字也会触发 Tk 重新布局"""
+        if self._widget_options.get(widget) != options:
+            self._widget_options[widget] = options
+            widget.config(**options)
     
     def _log(self, message, log_type='info'):
         """添加日志消息"""
@@ -1057,63 +1352,77 @@ class GameGUI(EventObserver):
             'type': log_type
         }
         self.all_logs.append(log_entry)
-        
-        # 显示日志
-        self._display_log_entry(log_entry)
+        for name, logs in self._filtered_logs.items():
+            if log_type in _LOG_FILTERS[name]:
+                logs.append(log_entry)
+        
+        # 只显示符合当前过滤条件的日志，先放入缓冲区，空闲时一次性插入
+        types = _LOG_FILTERS[self._log_filter]
+        if types is None or log_type in types:
+            self._log_buffer.append(log_entry)
+            if not self._log_flush_scheduled:
+                self._log_flush_scheduled = True
+                self.root.after_idle(self._flush_log)
     
-    def _display_log_entry(self, log_entry):
-        """显示单条日志"""
-        self.log_text.config(state=tk.NORMAL)
-        
-        # 插入时间戳
-        self.log_text.insert(tk.END, f"[{log_entry['timestamp']}] ", 'timestamp')
-        
-        # 根据类型添加图标和样式
-        icons = {
-            'info': '💬 ',
-            'warning': '⚠️ ',
-            'error': '❌ ',
-            'success': '✅ ',
-            'trade': '💰 ',
-            'move': '🚶 ',
-            'system': '⚙️ '
-        }
-        
-        icon = icons.get(log_entry['type'], '📝 ')
-        self.log_text.insert(tk.END, icon + log_entry['message'] + '\n', log_entry['type'])
+    def _flush_log(self):
+        """把缓冲区中的日志一次性插入文本框"""
+        self._log_flush_scheduled = False
+        if not self._log_buffer:
+            return
+        entries, self._log_buffer = self._log_buffer, []
         
+        self.log_text.config(state=tk.NORMAL)
+        self._display_log_entries(entries)
         self.log_text.config(state=tk.DISABLED)
         self.log_text.see(tk.END)
     
+    def _display_log_entries(self, entries):
+        """用一次插入显示多条日志（调用方负责切换文本框的可编辑状态）"""
+        entries = list(entries)[-_LOG_LIMIT:]
+        shown = self._shown_log_lines
+        
+        # 文本框中的日志数量与存储上限一致，超出时删除最早的日志
+        overflow = len(shown) + len(entries) - _LOG_LIMIT
+        if overflow > 0:
+            lines = sum(shown.popleft() for _ in range(overflow))
+            self.log_text.delete(1.0, f"{lines + 1}.0")
+        
+        # 时间戳和带图标的消息交替排列，各自附带样式标签
+        chunks = []
+        for log_entry in entries:
+            icon = _LOG_ICONS.get(log_entry['type'], '📝 ')
+            chunks += (f"[{log_entry['timestamp']}] ", 'timestamp',
+                       icon + log_entry['message'] + '\n', log_entry['type'])
+            shown.append(log_entry['message'].count('\n') + 1)
+        self.log_text.insert(tk.END, *chunks)
+    
+    def _clear_log_view(self):
+        """清空日志文本框（不影响已存储的日志）"""
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.delete(1.0, tk.END)
+        self.log_text.config(state=tk.DISABLED)
+        self._shown_log_lines.clear()
+        self._log_buffer.clear()
+    
     def _filter_logs(self, event=None):
         """过滤日志显示"""
-        filter_type = self.log_filter_var.get()
+        self._log_filter = self.log_filter_var.get()
+        logs = self._filtered_logs.get(self._log_filter, self.all_logs)
         
+        self._clear_log_view()
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        
-        for log_entry in self.all_logs:
-            if filter_type == "全部":
-                self._display_log_entry(log_entry)
-            elif filter_type == "重要" and log_entry['type'] in ['warning', 'error', 'success']:
-                self._display_log_entry(log_entry)
-            elif filter_type == "交易" and log_entry['type'] == 'trade':
-                self._display_log_entry(log_entry)
-            elif filter_type == "移动" and log_entry['type'] == 'move':
-                self._display_log_entry(log_entry)
-            elif filter_type == "系统" and log_entry['type'] == 'system':
-                self._display_log_entry(log_entry)
-        
+        self._display_log_entries(logs)
         self.log_text.config(state=tk.DISABLED)
+        self.log_text.see(tk.END)
     
     def _clear_logs(self):
         """清空日志"""
         import tkinter.messagebox as msgbox
         if msgbox.askyesno("确认", "确定要清空所有日志吗？"):
             self.all_logs.clear()
-            self.log_text.config(state=tk.NORMAL)
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.config(state=tk.DISABLED)
+            for logs in self._filtered_logs.values():
+                logs.clear()
+            self._clear_log_view()
             self._log("日志已清空", 'system')
     
     def _export_logs(self):
@@ -1159,10 +1468,8 @@ class GameGUI(EventObserver):
         """新游戏"""
         if messagebox.askyesno("新游戏", "确定要开始新游戏吗？当前进度将丢失。"):
             self.game_manager.reset_game()
-            self._update_player_list()
-            self._update_game_info()
-            self._draw_board()
-            self.log_text.delete(1.0, tk.END)
+            self._mark_dirty('players', 'info', 'board')
+            self._clear_log_view()
             self._update_ui_state()
     
     def _auto_start_game(self):
@@ -1172,7 +1479,7 @@ class GameGUI(EventObserver):
             self.game_manager.reset_game()
             
             # 更新游戏配置中的初始金币
-            self.game_manager.config.initial_money = self.initial_money
+            self.game_manager.config = replace(self.game_manager.config, initial_money=self.initial_money)
             
             # 添加玩家
             for player_data in self.players_data:
@@ -1183,12 +1490,11 @@ class GameGUI(EventObserver):
             
             # 开始游戏
             self.game_manager.start_game()
+            self._sync_player_colors()
             
             # 更新界面
-            self._update_player_list()
-            self._update_game_info()
-            self._draw_board()
-            self.log_text.delete(1.0, tk.END)
+            self._mark_dirty('players', 'info', 'board')
+            self._clear_log_view()
             self._update_ui_state()
             
             # 添加欢迎消息
@@ -1260,9 +1566,7 @@ class GameGUI(EventObserver):
             if selection:
                 save_name = saves[selection[0]]['save_name']
                 if self.game_manager.load_game(save_name):
-                    self._update_player_list()
-                    self._update_game_info()
-                    self._draw_board()
+                    self._mark_dirty('players', 'info', 'board')
                     self._update_ui_state()
                     messagebox.showinfo("成功", "游戏加载成功")
                     load_window.destroy()
@@ -1309,9 +1613,23 @@ class GameGUI(EventObserver):
         messagebox.showinfo("关于", about)
     
     def on_event_triggered(self, event_result: Dict[str, Any]):
-        """事件观察者回调"""
-        # 在主线程中更新UI
-        self.root.after(0, lambda: self._handle_event_notification(event_result))
+        """事件观察者回调：只把事件放入队列，不直接操作界面"""
+        self._event_queue.put(event_result)
+    
+    def _drain_events(self):
+        """在主线程中处理队列中的事件，一批事件只刷新一次玩家列表和棋盘"""
+        handled = 0
+        try:
+            while handled < _EVENT_DRAIN_LIMIT:
+                self._handle_event_notification(self._event_queue.get_nowait())
+                handled += 1
+        except Empty:
+            pass
+        
+        if handled:
+            # 更新玩家信息
+            self._mark_dirty('players', 'board')
+        self.root.after(_EVENT_POLL_MS, self._drain_events)
     
     def _handle_event_notification(self, event_result: Dict[str, Any]):
         """处理事件通知"""
@@ -1327,9 +1645,6 @@ class GameGUI(EventObserver):
         message = event_result.get("message", "")
         if message:
             self._log(message)
-        
-        # 更新玩家信息
-        self._update_player_list()
     
     def _on_closing(self):
         """关闭程序"""
@@ -1339,35 +1654,28 @@ class GameGUI(EventObserver):
     def restore_from_loaded_game(self):
         """从加载的游戏中恢复界面状态"""
         try:
-            # 更新玩家列表
-            self._update_player_list()
-            
-            # 更新游戏信息
-            self._update_game_info()
-            
-            # 重绘游戏板
-            self._draw_board()
+            # 更新玩家列表、游戏信息并重绘游戏板
+            self._mark_dirty('players', 'info', 'board')
             
             # 更新UI状态
             self._update_ui_state()
             
             # 如果游戏正在进行，启用相关按钮
             if self.game_manager.game_state == GameState.PLAYING:
-                self.roll_button.config(state=tk.NORMAL)
-                self.end_turn_button.config(state=tk.NORMAL)
+                self._config_if_changed(self.roll_button, state=tk.NORMAL)
+                self._config_if_changed(self.end_turn_button, state=tk.NORMAL)
                 
             print("游戏状态恢复完成")
         except Exception as e:
             print(f"恢复游戏状态时出错: {e}")
             self._log(f"恢复游戏状态失败: {str(e)}")
     
-    def _get_darker_color(self, color: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_darker_color(color: str) -> str:
         """获取更深的颜色"""
         try:
-            # 移除#号
-            color = color.lstrip('#')
-            # 转换为RGB
-            r, g, b = int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+            r, g, b = _hex_to_rgb(color)
             # 降低亮度
             r = max(0, int(r * 0.7))
             g = max(0, int(g * 0.7))
@@ -1376,13 +1684,12 @@ class GameGUI(EventObserver):
         except:
             return '#000000'
     
-    def _get_lighter_color(self, color: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_lighter_color(color: str) -> str:
         """获取更浅的颜色"""
         try:
-            # 移除#号
-            color = color.lstrip('#')
-            # 转换为RGB
-            r, g, b = int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+            r, g, b = _hex_to_rgb(color)
             # 提高亮度
             r = min(255, int(r + (255 - r) * 0.5))
             g = min(255, int(g + (255 - g) * 0.5))
@@ -1391,16 +1698,14 @@ class GameGUI(EventObserver):
         except:
             return '#FFFFFF'
     
-    def _is_dark_color(self, color: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _is_dark_color(color: str) -> bool:
         """判断颜色是否为深色"""
         try:
-            # 移除#号
-            color = color.lstrip('#')
-            # 转换为RGB
-            r, g, b = int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
-            # 计算亮度
-            brightness = (r * 299 + g * 587 + b * 114) / 1000
-            return brightness < 128
+            r, g, b = _hex_to_rgb(color)
+            # 计算亮度（整数比较，等价于 brightness / 1000 < 128）
+            return r * 299 + g * 587 + b * 114 < 128000
         except:
             return True
     
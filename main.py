@@ -237,7 +237,7 @@ class MonopolyGameApp:
                 self.config_manager.save_config(self.game_manager.config)
             
             if self.statistics_manager:
-                self.statistics_manager.save_statistics()
+                self.statistics_manager.save_statistics(force=True)
             
             # 直接关闭应用程序，不询问是否保存
             self.running = False
@@ -262,6 +262,10 @@ class MonopolyGameApp:
             if self.auto_save_thread and self.auto_save_thread.is_alive():
                 self.auto_save_thread.join(timeout=2)
             
+            # 写入尚未落盘的统计数据
+            if self.statistics_manager:
+                self.statistics_manager.flush()
+            
             # 关闭数据库连接
             if self.db_manager:
                 self.db_manager.close()